@@ -1,14 +1,17 @@
 import numpy as np
+from history import open_history
 
-def find_discovery(fitness_history, final_best_z, threshold_percent=0.1):
+def find_discovery(fitness_history, final_best_z, threshold_percent=0.1, chunk_size=1024):
     """
     Analisa o histórico de fitness para encontrar a primeira geração que se
     aproximou do resultado final.
 
     Args:
-        fitness_history (list): Lista de arrays com o fitness da população a cada geração.
+        fitness_history (list | np.ndarray | str): Lista de arrays com o fitness da população a cada geração,
+            um array (G, N) (inclusive np.memmap) ou o prefixo de um histórico gravado no modo 'memmap'.
         final_best_cost (float): O melhor valor de fitness encontrado ao final da execução.
         threshold_percent (float): A porcentagem de proximidade para considerar "descoberto". (ex: 1.0 para 1%, 0.1 para 0.1%)
+        chunk_size (int): Gerações lidas por vez quando o histórico é um array, para não carregá-lo inteiro.
 
     Returns:
         int: O índice da geração da descoberta, ou -1 se não for encontrado.
@@ -16,8 +19,20 @@ def find_discovery(fitness_history, final_best_z, threshold_percent=0.1):
     threshold_val = abs(final_best_z * (threshold_percent / 100.0)) + 1e-9
     target_fitness = final_best_z + threshold_val
 
+    if isinstance(fitness_history, str):
+        _, fitness_history = open_history(fitness_history) # Leitura preguiçosa do disco
+
+    if isinstance(fitness_history, np.ndarray):
+        # Varre em blocos: só as páginas de cada bloco são lidas do memmap
+        for start in range(0, len(fitness_history), chunk_size):
+            block_min = np.min(fitness_history[start:start + chunk_size], axis=1)
+            hits = np.flatnonzero(block_min <= target_fitness)
+            if hits.size:
+                return start + int(hits[0])
+        return -1
+
     for i, generation_fitnesses in enumerate(fitness_history):
         if np.min(generation_fitnesses) <= target_fitness:
             return i
     
-    return -1
\ No newline at end of file
+    return -1
@@ -1,57 +1,200 @@
+import os
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
+import matplotlib as mpl
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from history import open_history
+from landscape import landscape_grid
 
-def create_animation(population_history, fitness_history, objective_function, bounds, filename="animation.mp4", title="Animação de Otimização", particle_color='blue', particle_label='Partículas'):
+FRAME_CHUNK_SIZE = 8 # Quadros renderizados por tarefa no modo paralelo
+
+class FrameEncoder:
+    """
+    Processo do FFMpeg que recebe quadros RGBA brutos pela entrada padrão e grava o vídeo.
+    Os quadros já renderizados são enviados direto ao encoder, sem passar por savefig().
+    """
+    def __init__(self, filename: str, size: tuple, fps: int):
+        """
+        Args:
+            filename (str): Nome do arquivo de vídeo a ser salvo (.mp4, .gif, ...).
+            size (tuple): Largura e altura dos quadros, em pixels.
+            fps (int): Quadros por segundo do vídeo.
+        """
+        width, height = size
+        command = [mpl.rcParams['animation.ffmpeg_path'], '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-vcodec', 'rawvideo', '-s', f'{width}x{height}', '-pix_fmt', 'rgba',
+                   '-framerate', str(fps), '-i', 'pipe:']
+        if not filename.lower().endswith('.gif'):
+            command += ['-vcodec', 'h264', '-pix_fmt', 'yuv420p'] # Mesmos parâmetros do writer 'ffmpeg' do matplotlib
+        command.append(filename)
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def write(self, frame):
+        """ Envia um quadro RGBA (height, width, 4) ao encoder. """
+        self._process.stdin.write(frame)
+
+    def close(self):
+        """ Finaliza o vídeo e levanta RuntimeError se o FFMpeg falhar. """
+        _, stderr = self._process.communicate()
+        if self._process.returncode != 0:
+            raise RuntimeError(f"FFMpeg terminou com código {self._process.returncode}: {stderr.decode(errors='replace').strip()}")
+
+    def abort(self):
+        """ Interrompe o encoder após um erro. """
+        self._process.kill()
+        self._process.communicate()
+
+class FrameRenderer:
+    """
+    Renderizador de quadros com blitting: o fundo (curvas de nível, eixos, legenda e grade)
+    é desenhado uma única vez e guardado como imagem; em cada quadro apenas as posições
+    das partículas e o título são redesenhados sobre ele.
+    """
+    def __init__(self, X, Y, Z_background, z_range, bounds, first_population, title, particle_color, particle_label, num_frames, dpi):
+        """
+        Args:
+            X, Y, Z_background (np.ndarray): Grade do fundo e valores da função objetivo.
+            z_range (tuple): Mínimo e máximo de Z_background, extremos das curvas de nível.
+            bounds (tuple): Tupla com os limites ( (mins), (maxs) ).
+            first_population (np.ndarray): População do primeiro quadro (usada na legenda).
+            title (str): Título base para a animação.
+            particle_color (str): Cor para as partículas/indivíduos.
+            particle_label (str): Legenda para as partículas/indivíduos.
+            num_frames (int): Número total de quadros (exibido no título).
+            dpi (int): Resolução dos quadros.
+        """
+        self.title = title
+        self.num_frames = num_frames
+        fitness_levels = np.linspace(z_range[0], z_range[1], 50)
+
+        # Figura fora do pyplot, renderizada diretamente pelo canvas Agg
+        self.fig = Figure(figsize=(10, 8), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.ax = self.fig.subplots()
+
+        # --- FUNDO ESTÁTICO (desenhado uma única vez) ---
+        ax.contourf(X, Y, Z_background, levels=fitness_levels, cmap='autumn', alpha=0.7, zorder=1)
+        first_population = np.asarray(first_population)
+        self.scatter = ax.scatter(first_population[:, 0], first_population[:, 1],
+                                  marker='o', color=particle_color, alpha=0.7, zorder=10, label=particle_label, animated=True)
+        ax.set_xlabel("X")
+        ax.set_ylabel("Y")
+        self.title_text = ax.set_title(title, fontsize=16)
+        self.title_text.set_animated(True)
+        ax.legend(loc='upper right', fontsize=12)
+        ax.set_xlim(bounds[0][0], bounds[1][0])
+        ax.set_ylim(bounds[0][1], bounds[1][1])
+        ax.grid(True, linestyle='--', alpha=1)
+        ax.set_aspect('equal', adjustable='box')
+
+        self.canvas.draw() # Artistas 'animated' ficam de fora do fundo
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+
+    @property
+    def size(self) -> tuple:
+        return self.canvas.get_width_height()
+
+    def render(self, i, population, fitness):
+        """
+        Restaura o fundo e desenha apenas as partículas e o título do quadro i.
+        Returns:
+            memoryview: Buffer RGBA (height, width, 4) do canvas, sobrescrito no próximo quadro.
+        """
+        current_population = np.asarray(population)
+        current_fitness = np.min(fitness)
+
+        self.canvas.restore_region(self.background)
+        self.scatter.set_offsets(current_population[:, :2])
+        self.title_text.set_text(f'{self.title} - Iteração {i}/{self.num_frames-1} | Melhor Z: {current_fitness:.8f}')
+        self.ax.draw_artist(self.scatter)
+        self.ax.draw_artist(self.title_text)
+        return self.canvas.buffer_rgba()
+
+# Renderizador de cada processo do pool, criado uma única vez por _init_render_worker
+_worker_renderer = None
+
+def _init_render_worker(renderer_args):
+    global _worker_renderer
+    _worker_renderer = FrameRenderer(*renderer_args)
+
+def _render_frames(start, populations, fitnesses):
+    """ Renderiza os quadros start, start+1, ... e devolve os bytes RGBA brutos de cada um. """
+    return [bytes(_worker_renderer.render(start + k, population, fitness))
+            for k, (population, fitness) in enumerate(zip(populations, fitnesses))]
+
+def _parallel_frames(population_history, fitness_history, renderer_args, workers):
+    """
+    Renderiza os quadros em blocos de FRAME_CHUNK_SIZE em um pool de processos.
+    Yields:
+        bytes: Quadros RGBA na ordem original, prontos para o encoder.
+    """
+    num_frames = len(population_history)
+    starts = iter(range(0, num_frames, FRAME_CHUNK_SIZE))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker, initargs=(renderer_args,)) as executor:
+        def submit(start):
+            end = start + FRAME_CHUNK_SIZE
+            return executor.submit(_render_frames, start, population_history[start:end], fitness_history[start:end])
+
+        # Limita os blocos em andamento para não acumular quadros brutos na memória
+        pending = deque(submit(start) for _, start in zip(range(2 * workers), starts))
+        while pending:
+            frames = pending.popleft().result()
+            next_start = next(starts, None)
+            if next_start is not None:
+                pending.append(submit(next_start))
+            yield from frames
+
+def create_animation(population_history, fitness_history, objective_function, bounds, filename="animation.mp4", title="Animação de Otimização", particle_color='blue', particle_label='Partículas', fps=1, dpi=120, workers=1):
     """
     Cria e salva uma animação do processo de otimização.
 
+    Os quadros são renderizados com blitting (ver FrameRenderer) e enviados a um único
+    encoder. Com workers > 1, blocos de quadros são renderizados em paralelo e entregues
+    ao encoder na ordem original, de modo que o vídeo é idêntico ao da renderização serial.
+
     Args:
-        population_history (list): Lista de arrays 2D com as posições da população a cada iteração.
-        fitness_history (list): Lista com o fitness da população a cada iteração.
-        objective_function (callable): A função objetivo para plotar o fundo.
+        population_history (list | np.ndarray | str): Lista de arrays 2D com as posições da população a cada iteração,
+            um array (G, N, D) ou o prefixo de um histórico gravado no modo 'memmap' (lido sob demanda, quadro a quadro).
+        fitness_history (list | np.ndarray): Lista com o fitness da população a cada iteração. Ignorado quando
+            population_history é um prefixo de histórico em disco.
+        objective_function (ObjectiveFunction | str | callable): A função objetivo para plotar o fundo (ver landscape_grid).
         bounds (tuple): Tupla com os limites ( (mins), (maxs) ).
         filename (str): Nome do arquivo de vídeo a ser salvo.
         title (str): Título base para a animação.
         particle_color (str): Cor para as partículas/indivíduos.
         particle_label (str): Legenda para as partículas/indivíduos.
+        fps (int): Quadros por segundo do vídeo.
+        dpi (int): Resolução dos quadros.
+        workers (int): Número de processos que renderizam os quadros. None usa os.cpu_count(). Com 1, renderiza no processo atual.
     """
+    if isinstance(population_history, str):
+        population_history, fitness_history = open_history(population_history)
+
     actual_iterations = len(population_history)
 
-    x_range = np.arange(bounds[0][0], bounds[1][0] + 1, 10)
-    y_range = np.arange(bounds[0][1], bounds[1][1] + 1, 10)
-    X, Y = np.meshgrid(x_range, y_range)
-    Z_background = objective_function(X, Y)
-    
-    fitness_levels = np.linspace(np.min(Z_background), np.max(Z_background), 50)
-
-    fig, ax = plt.subplots(figsize=(10, 8))
-
-    def animate(i):
-        ax.clear()
-        
-        current_population = population_history[i]
-        current_fitness = np.min(fitness_history[i])
-        
-        ax.contourf(X, Y, Z_background, levels=fitness_levels, cmap='autumn', alpha=0.7, zorder=1)
-        
-        ax.scatter(current_population[:, 0], current_population[:, 1], 
-                   marker='o', color=particle_color, alpha=0.7, zorder=10, label=particle_label)
+    # Fundo lido do cache de paisagens, sem contar avaliações na função do otimizador
+    X, Y, Z_background, z_min, z_max = landscape_grid(objective_function, bounds, step=10)
 
-        ax.set_xlabel("X")
-        ax.set_ylabel("Y")
-        ax.set_title(f'{title} - Iteração {i}/{actual_iterations-1} | Melhor Z: {current_fitness:.8f}', fontsize=16)
-        ax.legend(loc='upper right', fontsize=12)
-        ax.set_xlim(bounds[0][0], bounds[1][0])
-        ax.set_ylim(bounds[0][1], bounds[1][1])
-        ax.grid(True, linestyle='--', alpha=1)
-        ax.set_aspect('equal', adjustable='box')
+    renderer_args = (X, Y, Z_background, (z_min, z_max), bounds, population_history[0], title, particle_color, particle_label,
+                     actual_iterations, dpi)
+    renderer = FrameRenderer(*renderer_args)
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        frames = (renderer.render(i, population_history[i], fitness_history[i]) for i in range(actual_iterations))
+    else:
+        frames = _parallel_frames(population_history, fitness_history, renderer_args, workers)
 
-    anim = FuncAnimation(fig, animate, frames=actual_iterations, interval=150, blit=False)
+    encoder = None
     try:
-        anim.save(filename, writer='ffmpeg', fps=1, dpi=120)
+        encoder = FrameEncoder(filename, renderer.size, fps)
+        for frame in frames:
+            encoder.write(frame)
+        encoder.close()
     except Exception as e:
+        if encoder is not None:
+            encoder.abort()
         print(f"Erro ao salvar a animação: {e}")
         print("Verifique se o FFMpeg está instalado e acessível no PATH do sistema.")
-    
-    plt.close(fig) # Fecha a figura para liberar memória
\ No newline at end of file
@@ -1,7 +1,8 @@
 import streamlit as st
 import chat
-import os
-import base64
+import media
+
+RECENT_MEDIA_TURNS = 3 # Respostas mais recentes com as mídias já abertas
 
 st.session_state.setdefault("chat_history", [])
 
@@ -127,40 +128,16 @@ with tab_chat:
     st.markdown("Faça perguntas sobre o projeto, as funções e os resultados")
 
 
-    for interaction in st.session_state.chat_history:
+    for index, interaction in enumerate(st.session_state.chat_history):
         with st.chat_message("user"):
             st.markdown(interaction["question"])
             
         with st.chat_message("model"):
             st.markdown(interaction["answer"])
             
-            if interaction["images"]:
-                for img_path in interaction["images"]:
-                    if os.path.exists(img_path):
-                        # Detecta se é vídeo ou imagem para exibir corretamente
-                        _, ext = os.path.splitext(img_path)
-                        if ext.lower() == '.mp4':
-                            st.video(img_path)
-                        elif ext.lower() == '.gif':
-                            # Lê o GIF e converte para base64 para garantir a animação
-                            try:
-                                with open(img_path, "rb") as f:
-                                    contents = f.read()
-                                    data_url = base64.b64encode(contents).decode("utf-8")
-                                
-                                # Renderiza via Markdown/HTML
-                                st.markdown(
-                                    f'<img src="data:image/gif;base64,{data_url}" width="800" alt="gif animado">',
-                                    unsafe_allow_html=True,
-                                )
-                            except Exception as e:
-                                st.error(f"Erro ao carregar GIF: {e}")
-                        
-                        # Imagens estáticas normais (png, jpg)
-                        else:
-                            st.image(img_path, caption=f"Imagem: {img_path}", width=600)
-                    else:
-                        st.warning(f"Arquivo {img_path} não encontrado no servidor.")
+            # Mídias das respostas antigas só são carregadas sob demanda (custo do rerun não cresce com o histórico)
+            media.render_media_list(interaction["images"], key=f"media_{index}",
+                                    expanded=index >= len(st.session_state.chat_history) - RECENT_MEDIA_TURNS)
 
     with st.form(key="chat_form", clear_on_submit=True):
         user_prompt = st.text_input("Faça sua pergunta:", placeholder="Ex: Qual algoritmo teve o melhor desempenho?", key="chat_input")
@@ -0,0 +1,51 @@
+import numpy as np
+from function import ObjectiveFunction
+
+# ==============================================================================
+# AVALIAÇÃO CONJUNTA DE VÁRIOS OTIMIZADORES ASK/TELL (GA e PSO)
+# ==============================================================================
+# Uso:
+#     optimizers = [GA(50, bounds, max_generations=200, rng=seed) for seed in range(100)]
+#     optimizers += [PSO(30, bounds, max_iterations=200, rng=seed) for seed in range(100)]
+#     results = run_together(obj_func, optimizers)
+# A cada passo, os blocos (N, D) de todos os otimizadores ativos com a mesma dimensão
+# são concatenados e avaliados em uma única chamada a obj_func.evaluate(), em vez de
+# uma chamada pequena por otimizador.
+
+def step_together(obj_func: ObjectiveFunction, optimizers: list) -> int:
+    """
+    Executa um passo (ask, avaliação em lote, tell) de todos os otimizadores que ainda não pararam.
+    Args:
+        obj_func (ObjectiveFunction): Função objetivo compartilhada.
+        optimizers (list): Instâncias de GA/PSO (ou qualquer objeto com ask(), tell() e 'stopped').
+    Returns:
+        int: Número de otimizadores que deram o passo.
+    """
+    blocks_by_dim = {} # Dimensão -> [(otimizador, bloco (N, D))]
+    for optimizer in optimizers:
+        if not optimizer.stopped:
+            block = optimizer.ask()
+            blocks_by_dim.setdefault(block.shape[-1], []).append((optimizer, block))
+
+    for entries in blocks_by_dim.values():
+        fitness = obj_func.evaluate(np.concatenate([block for _, block in entries]))
+        start = 0
+        for optimizer, block in entries:
+            optimizer.tell(fitness[start:start + len(block)])
+            start += len(block)
+    return sum(len(entries) for entries in blocks_by_dim.values())
+
+def run_together(obj_func: ObjectiveFunction, optimizers: list, on_step=None) -> list:
+    """
+    Executa todos os otimizadores até que parem, avaliando-os em lote a cada passo.
+    Args:
+        obj_func (ObjectiveFunction): Função objetivo compartilhada.
+        optimizers (list): Instâncias de GA/PSO. Cada uma segue seu próprio critério de parada.
+        on_step (callable): Chamado após cada passo com a lista de otimizadores. Se retornar True, a execução é interrompida.
+    Returns:
+        list: Uma tupla (melhor posição, melhor fitness, contador de operações) por otimizador, na mesma ordem.
+    """
+    while step_together(obj_func, optimizers):
+        if on_step is not None and on_step(optimizers):
+            break
+    return [(*optimizer.result(), optimizer.operation_counts()) for optimizer in optimizers]
@@ -0,0 +1,328 @@
+import asyncio
+from collections import deque
+from time import perf_counter
+import numpy as np
+from function import ObjectiveFunction
+from costs import GA_COSTS, pso_update_cost, operation_totals
+
+# ==============================================================================
+# AVALIAÇÃO ASSÍNCRONA (FUNÇÕES OBJETIVO LENTAS, EX: SIMULAÇÕES)
+# ==============================================================================
+# Em ga() e pso() cada geração/iteração espera a avaliação mais lenta do lote. Aqui um
+# número fixo de avaliações ('concurrency') fica sempre em andamento contra um avaliador
+# assíncrono (async def evaluator(ponto (D,)) -> float), e o algoritmo avança a cada
+# resultado que chega:
+# - ga_async: GA steady-state; cada filho avaliado substitui o pior indivíduo, se for melhor
+# - pso_async: PSO assíncrono; cada partícula atualiza pbest/gbest e se move assim que sua
+#   avaliação termina, sem esperar o resto do enxame
+# - run_generational: executa um GA/PSO ask/tell (ga.py, pso.py) avaliando cada bloco de forma
+#   concorrente, mas esperando o lote inteiro (referência para comparar a utilização)
+# Como a ordem de chegada dos resultados depende da latência, as execuções assíncronas não
+# são reprodutíveis pela semente.
+#
+# Uso:
+#     evaluator = SimulatedEvaluator(ObjectiveFunction('rastrigin'), mean_latency=0.05, latency_cv=1.0)
+#     best, best_fitness, counter = asyncio.run(ga_async(evaluator, 50, bounds, max_evaluations=5000, concurrency=16))
+#     print(counter['evaluations_per_second'], counter['utilization'])
+
+class SimulatedEvaluator:
+    """
+    Avaliador assíncrono local que simula um serviço lento: cada avaliação espera uma latência
+    aleatória (distribuição gama com média 'mean_latency' e coeficiente de variação 'latency_cv')
+    e então calcula a função objetivo no ponto.
+    """
+    def __init__(self, obj_func: ObjectiveFunction, mean_latency: float=0.01, latency_cv: float=1.0, rng=None):
+        """
+        Args:
+            obj_func (ObjectiveFunction): Função objetivo avaliada.
+            mean_latency (float): Latência média por avaliação, em segundos.
+            latency_cv (float): Desvio padrão da latência dividido pela média (0 = latência fixa).
+            rng (np.random.Generator | int | None): Gerador das latências (separado do gerador do algoritmo).
+        """
+        self.obj_func = obj_func
+        self.mean_latency = mean_latency
+        self.latency_cv = latency_cv
+        self.rng = np.random.default_rng(rng)
+
+    def _latency(self) -> float:
+        if self.latency_cv <= 0:
+            return self.mean_latency
+        shape = 1.0 / self.latency_cv**2
+        return self.rng.gamma(shape, self.mean_latency / shape)
+
+    async def __call__(self, point: np.ndarray) -> float:
+        await asyncio.sleep(self._latency())
+        return float(self.obj_func.evaluate(point))
+
+async def _evaluation_loop(evaluator, next_point, on_result, concurrency: int, max_evaluations: int, should_stop) -> dict:
+    """
+    Mantém até 'concurrency' avaliações em andamento e entrega cada resultado assim que fica pronto.
+    Args:
+        evaluator: Avaliador assíncrono, evaluator(ponto (D,)) -> float.
+        next_point (callable): Devolve (etiqueta, ponto) a ser avaliado, ou None se não há ponto pronto agora.
+        on_result (callable): Recebe (etiqueta, ponto, fitness) de cada avaliação concluída.
+        concurrency (int): Número máximo de avaliações simultâneas.
+        max_evaluations (int): Total de avaliações a serem feitas.
+        should_stop (callable): Critério de parada antecipada, verificado após cada resultado.
+    Returns:
+        dict: 'evaluations', 'elapsed' (s), 'evaluations_per_second' e 'utilization' (fração do tempo
+              em que os 'concurrency' avaliadores estiveram ocupados).
+    """
+    pending = {} # Tarefa -> (etiqueta, ponto, instante de envio)
+    submitted = completed = 0
+    busy_time = 0.0
+    start = perf_counter()
+    try:
+        while True:
+            while len(pending) < concurrency and submitted < max_evaluations:
+                item = next_point()
+                if item is None: # O algoritmo precisa de mais resultados antes de propor novos pontos
+                    break
+                tag, point = item
+                pending[asyncio.ensure_future(evaluator(point))] = (tag, point, perf_counter())
+                submitted += 1
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            now = perf_counter()
+            for task in done:
+                tag, point, sent_at = pending.pop(task)
+                busy_time += now - sent_at
+                completed += 1
+                on_result(tag, point, task.result())
+            if should_stop():
+                break
+    finally:
+        for task in pending: # Parada antecipada: as avaliações em andamento são descartadas
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    elapsed = perf_counter() - start
+    return {
+        'evaluations': completed,
+        'elapsed': elapsed,
+        'evaluations_per_second': completed / elapsed if elapsed > 0 else 0.0,
+        'utilization': busy_time / (concurrency * elapsed) if elapsed > 0 else 0.0,
+    }
+
+async def ga_async(evaluator, num_individuals: int, bounds: tuple, max_evaluations: int, concurrency: int=8,
+                   crossover_rate: float=0.9, mutation_rate: float=0.5, mutation_strength: float=1.0,
+                   tolerance: float=1e-6, patience: int=10, rng=None, count_ops: bool=True) -> tuple:
+    """
+    Algoritmo Genético steady-state com avaliação assíncrona.
+    Um novo filho (seleção por roleta de ranking, BLX-⍺ e mutação gaussiana, como em ga()) é gerado a cada
+    vaga de avaliação livre; quando seu fitness chega, ele substitui o pior indivíduo da população se for melhor.
+    Args:
+        evaluator: Avaliador assíncrono, evaluator(ponto (D,)) -> float (ex: SimulatedEvaluator).
+        num_individuals (int): Número de indivíduos na população.
+        bounds (tuple): Limites inferior e superior para os indivíduos. O tamanho dos limites define a dimensão D.
+        max_evaluations (int): Número máximo de avaliações da função objetivo.
+        concurrency (int): Número de avaliações simultâneas.
+        crossover_rate (float): Taxa de crossover.
+        mutation_rate (float): Taxa de mutação.
+        mutation_strength (float): Força da mutação.
+        tolerance (float): Tolerância para considerar convergência.
+        patience (int): Blocos de 'num_individuals' avaliações (o equivalente a uma geração) sem melhoria antes de parar.
+        rng (np.random.Generator | int | None): Gerador de números aleatórios ou semente.
+        count_ops (bool): Se False, não contabiliza multiplicações/divisões dos operadores.
+    Returns:
+        tuple: Melhor indivíduo encontrado, seu valor de fitness e contador (operações, 'evaluations',
+               'elapsed', 'evaluations_per_second' e 'utilization').
+    """
+    rng = np.random.default_rng(rng)
+    dim = len(bounds[0])
+    alpha = 0.5 # Fator de mistura do BLX
+    population = np.empty((num_individuals, dim))
+    fitness = np.full(num_individuals, np.inf)
+    num_evaluated = 0 # Vagas já ocupadas por indivíduos avaliados (as primeiras)
+    num_initial = 0 # Indivíduos iniciais já enviados para avaliação
+    rank_aptitude = np.arange(num_individuals, 0, -1) # Aptidões por posição no ranking, de N a 1
+    ops = {'selection': 0, 'crossover': 0, 'mutation': 0}
+    state = {'best_fitness': np.inf, 'best_individual': None, 'last_improvement': 0, 'evaluations': 0}
+
+    def next_point():
+        nonlocal num_initial
+        if num_initial < num_individuals: # População inicial aleatória
+            num_initial += 1
+            return None, rng.uniform(bounds[0], bounds[1])
+        if num_evaluated < 2: # Ainda não há pais avaliados
+            return None
+
+        # --- SELEÇÃO POR ROLETA (entre os já avaliados) ---
+        ranked_indices = np.argsort(fitness[:num_evaluated]) # Índices dos indivíduos ordenados por fitness
+        aptitude = rank_aptitude[num_individuals - num_evaluated:] # Aptidões de num_evaluated a 1
+        parent1, parent2 = population[ranked_indices[rng.choice(num_evaluated, size=2, p=aptitude / np.sum(aptitude))]]
+        ops['selection'] += 2
+
+        # --- BLEND CROSSOVER (BLX-⍺) ---
+        if rng.random() < crossover_rate:
+            d = np.abs(parent1 - parent2)
+            child = rng.uniform(np.minimum(parent1, parent2) - alpha * d, np.maximum(parent1, parent2) + alpha * d)
+            ops['crossover'] += dim
+        else:
+            child = parent1.copy()
+
+        # --- MUTAÇÃO ---
+        mask = rng.random(dim) < mutation_rate
+        num_mutations = int(np.sum(mask))
+        child[mask] += rng.normal(0, mutation_strength, size=num_mutations)
+        ops['mutation'] += num_mutations
+        return None, np.clip(child, bounds[0], bounds[1])
+
+    def on_result(_, point, value):
+        nonlocal num_evaluated
+        state['evaluations'] += 1
+        if num_evaluated < num_individuals: # População ainda incompleta: ocupa a próxima vaga
+            slot = num_evaluated
+            num_evaluated += 1
+        else: # Steady-state: substitui o pior indivíduo, se for melhor
+            slot = int(np.argmax(fitness))
+            if value >= fitness[slot]:
+                slot = None
+        if slot is not None:
+            population[slot] = point
+            fitness[slot] = value
+
+        if value < state['best_fitness'] - tolerance: # Melhoria significativa
+            state['last_improvement'] = state['evaluations']
+        if value < state['best_fitness']:
+            state['best_fitness'] = value
+            state['best_individual'] = point.copy()
+
+    def should_stop():
+        return state['evaluations'] - state['last_improvement'] >= patience * num_individuals
+
+    counter = await _evaluation_loop(evaluator, next_point, on_result, concurrency, max_evaluations, should_stop)
+    if count_ops:
+        counter.update(operation_totals(GA_COSTS, ops))
+    else:
+        counter.update({'multiplications': 0, 'divisions': 0})
+    return state['best_individual'], state['best_fitness'], counter
+
+async def pso_async(evaluator, num_particles: int, bounds: tuple, max_evaluations: int, concurrency: int=8,
+                    cognitive_coeff: float=1.5, social_coeff: float=1.5, min_w: float=0.2, max_w: float=0.9,
+                    tolerance: float=1e-6, patience: int=10, rng=None, count_ops: bool=True) -> tuple:
+    """
+    PSO assíncrono: cada partícula atualiza seu pbest e o gbest assim que sua avaliação termina e já calcula
+    a nova velocidade e posição com o gbest daquele instante, sem esperar o resto do enxame.
+    Args:
+        evaluator: Avaliador assíncrono, evaluator(ponto (D,)) -> float (ex: SimulatedEvaluator).
+        num_particles (int): Número de partículas no enxame (limita as avaliações simultâneas úteis).
+        bounds (tuple): Limites inferior e superior para as partículas. O tamanho dos limites define a dimensão D.
+        max_evaluations (int): Número máximo de avaliações da função objetivo.
+        concurrency (int): Número de avaliações simultâneas.
+        cognitive_coeff (float): Coeficiente cognitivo (peso da experiência pessoal).
+        social_coeff (float): Coeficiente social (peso da experiência do grupo).
+        min_w (float): Peso mínimo da inércia. (maior que 0)
+        max_w (float): Peso máximo da inércia (max 1)
+        tolerance (float): Tolerância para considerar que não houve melhoria significativa.
+        patience (int): Blocos de 'num_particles' avaliações (o equivalente a uma iteração) sem melhoria antes de parar.
+        rng (np.random.Generator | int | None): Gerador de números aleatórios ou semente.
+        count_ops (bool): Se False, não contabiliza multiplicações/divisões dos operadores.
+    Returns:
+        tuple: Melhor posição encontrada, seu valor de fitness e contador (operações, 'evaluations',
+               'elapsed', 'evaluations_per_second' e 'utilization').
+    """
+    rng = np.random.default_rng(rng)
+    dim = len(bounds[0])
+    particles = rng.uniform(bounds[0], bounds[1], (num_particles, dim))
+    velocities = np.zeros_like(particles)
+    personal_best_positions = particles.copy()
+    personal_best_fitness = np.full(num_particles, np.inf)
+    ready = deque(range(num_particles)) # Partículas com posição nova aguardando avaliação
+    state = {'global_best_fitness': np.inf, 'global_best_position': None, 'last_improvement': 0,
+             'evaluations': 0, 'updates': 0}
+
+    def next_point():
+        if not ready:
+            return None
+        i = ready.popleft()
+        return i, particles[i].copy()
+
+    def on_result(i, point, value):
+        state['evaluations'] += 1
+        if value < personal_best_fitness[i]:
+            personal_best_fitness[i] = value
+            personal_best_positions[i] = point
+        if value < state['global_best_fitness'] - tolerance: # Melhoria significativa
+            state['last_improvement'] = state['evaluations']
+        if value < state['global_best_fitness']:
+            state['global_best_fitness'] = value
+            state['global_best_position'] = point.copy()
+
+        # --- MOVIMENTO DA PARTÍCULA (com o gbest atual) ---
+        r1 = rng.random(dim) # Fator aleatório para componente cognitivo
+        r2 = rng.random(dim) # Fator aleatório para componente social
+        progress = min(state['evaluations'] / max_evaluations, 1.0) # Inércia decresce com as avaliações feitas
+        inertia_weight = max(min(max_w - (max_w - min_w) * progress, max_w), min_w)
+        velocities[i] = (inertia_weight * velocities[i]
+                         + cognitive_coeff * r1 * (personal_best_positions[i] - point)
+                         + social_coeff * r2 * (state['global_best_position'] - point))
+        particles[i] = np.clip(point + velocities[i], bounds[0], bounds[1])
+        state['updates'] += 1
+        ready.append(i)
+
+    def should_stop():
+        return state['evaluations'] - state['last_improvement'] >= patience * num_particles
+
+    counter = await _evaluation_loop(evaluator, next_point, on_result, concurrency, max_evaluations, should_stop)
+    if count_ops:
+        counter.update(operation_totals({'update': pso_update_cost(dim)}, {'update': state['updates']}))
+    else:
+        counter.update({'multiplications': 0, 'divisions': 0})
+    return state['global_best_position'], state['global_best_fitness'], counter
+
+async def run_generational(evaluator, optimizer, concurrency: int=8) -> tuple:
+    """
+    Executa um otimizador ask/tell (GA de ga.py ou PSO de pso.py) avaliando cada bloco com até 'concurrency'
+    avaliações simultâneas, mas esperando o bloco inteiro antes de avançar (mesma semântica de ga()/pso()).
+    Args:
+        evaluator: Avaliador assíncrono, evaluator(ponto (D,)) -> float.
+        optimizer: Instância de GA ou PSO.
+        concurrency (int): Número de avaliações simultâneas.
+    Returns:
+        tuple: Melhor posição, seu fitness e contador no mesmo formato de ga_async()/pso_async().
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    busy_time = 0.0
+
+    async def evaluate(point):
+        nonlocal busy_time
+        async with semaphore:
+            sent_at = perf_counter()
+            value = await evaluator(point)
+            busy_time += perf_counter() - sent_at
+            return value
+
+    start = perf_counter()
+    while not optimizer.stopped:
+        block = optimizer.ask()
+        optimizer.tell(np.array(await asyncio.gather(*(evaluate(point) for point in block))))
+    elapsed = perf_counter() - start
+
+    counter = optimizer.operation_counts()
+    counter.update({
+        'elapsed': elapsed,
+        'evaluations_per_second': counter['evaluations'] / elapsed if elapsed > 0 else 0.0,
+        'utilization': busy_time / (concurrency * elapsed) if elapsed > 0 else 0.0,
+    })
+    return (*optimizer.result(), counter)
+
+if __name__ == '__main__':
+    # Comparação rápida: GA geracional x steady-state com latência bem variável
+    from ga import GA
+    from pso import PSO
+    bounds = (np.full(2, -500.0), np.full(2, 500.0))
+    evaluator = SimulatedEvaluator(ObjectiveFunction('schwefel_rosenbrock'), mean_latency=0.005, latency_cv=1.5, rng=0)
+    runs = {
+        'GA geracional': run_generational(evaluator, GA(32, bounds, max_generations=30, patience=31, rng=0), concurrency=16),
+        'GA steady-state': ga_async(evaluator, 32, bounds, max_evaluations=32 * 31, concurrency=16, patience=31, rng=0),
+        'PSO síncrono': run_generational(evaluator, PSO(32, bounds, 30, patience=31, rng=0), concurrency=16),
+        'PSO assíncrono': pso_async(evaluator, 32, bounds, max_evaluations=32 * 31, concurrency=16, patience=31, rng=0),
+    }
+    for name, coroutine in runs.items():
+        _, best_fitness, counter = asyncio.run(coroutine)
+        print(f"{name:<16} melhor {best_fitness:12.4f} | {counter['evaluations']} avaliações em {counter['elapsed']:.2f} s "
+              f"| {counter['evaluations_per_second']:.0f} avaliações/s | utilização {counter['utilization']:.0%}")
@@ -0,0 +1,206 @@
+import os
+import io
+import sys
+import json
+import timeit
+import platform
+import argparse
+import tracemalloc
+import subprocess
+import contextlib
+from datetime import datetime, timezone
+import numpy as np
+from function import ObjectiveFunction
+from ga import ga
+from pso import pso
+
+# ==============================================================================
+# SUÍTE DE BENCHMARKS (FUNÇÕES OBJETIVO, GA E PSO)
+# ==============================================================================
+# Uso:
+#     python benchmark.py run                 # Executa e acrescenta o resultado ao histórico
+#     python benchmark.py run --quick         # Versão reduzida, para conferências rápidas
+#     python benchmark.py compare             # Compara as duas últimas execuções do histórico
+#     python benchmark.py compare --threshold 0.05 --baseline -3
+# O 'compare' termina com código 1 se algum caso ficou mais lento (ou usou mais memória)
+# que o limite, para ser usado em scripts.
+
+HISTORY_FILE = 'benchmark_history.json'
+DEFAULT_THRESHOLD = 0.10 # 10% mais lento que a referência conta como regressão
+
+OBJECTIVES = ('schwefel_rosenbrock', 'rastrigin')
+OBJECTIVE_DIMS = (2, 10, 30)
+OBJECTIVE_BATCHES = (64, 1024, 16384)
+ENGINE_DIMS = (2, 10)
+ENGINE_POPULATIONS = (30, 100, 500)
+ENGINE_GENERATIONS = 50
+
+def _best_time(func, repeat: int) -> float:
+    """
+    Menor tempo médio por chamada entre 'repeat' rodadas. O número de chamadas por rodada é
+    calibrado (timeit.autorange) para que cada rodada dure ao menos 0.2 s, reduzindo o ruído.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def _peak_memory(func) -> int:
+    """ Pico de memória alocada (bytes, via tracemalloc) durante uma chamada. """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def _measure(func, repeat: int) -> dict:
+    func() # Aquecimento: buffers de trabalho e caches já alocados
+    return {'seconds': _best_time(func, repeat), 'peak_bytes': _peak_memory(func)}
+
+def objective_cases(quick: bool=False):
+    """
+    Casos de avaliação em lote da função objetivo, por função, dimensão e tamanho do lote.
+    Yields:
+        tuple: Nome do caso, função sem argumentos a ser medida e número de pontos avaliados por chamada.
+    """
+    rng = np.random.default_rng(0)
+    for name in OBJECTIVES:
+        obj_func = ObjectiveFunction(name)
+        for dim in OBJECTIVE_DIMS[:2] if quick else OBJECTIVE_DIMS:
+            for batch in OBJECTIVE_BATCHES[:2] if quick else OBJECTIVE_BATCHES:
+                points = rng.uniform(-500, 500, (batch, dim))
+                yield f"objective/{name}/D={dim}/N={batch}", lambda f=obj_func, p=points: f.evaluate(p), batch
+        # Caminho 2-D f(X, Y) usado nos gráficos
+        X, Y = np.meshgrid(np.arange(-500, 501, 10), np.arange(-500, 501, 10))
+        yield f"objective/{name}/meshgrid", lambda f=obj_func: f(X, Y), X.size
+
+def engine_cases(quick: bool=False):
+    """
+    Casos de execução do GA e do PSO por dimensão e tamanho da população, com número fixo de gerações.
+    Yields:
+        tuple: Nome do caso, função sem argumentos a ser medida e número de gerações por chamada.
+    """
+    generations = ENGINE_GENERATIONS // 5 if quick else ENGINE_GENERATIONS
+    fixed = {'tolerance': -np.inf, 'patience': generations + 1, 'history': 'off', 'rng': 0} # Sem parada antecipada
+    for dim in ENGINE_DIMS:
+        bounds = (np.full(dim, -500.0), np.full(dim, 500.0))
+        for size in ENGINE_POPULATIONS[:2] if quick else ENGINE_POPULATIONS:
+            obj_func = ObjectiveFunction('schwefel_rosenbrock')
+            yield (f"ga/D={dim}/N={size}",
+                   lambda b=bounds, n=size: ga(obj_func, n, generations, b, **fixed), generations)
+            yield (f"pso/D={dim}/N={size}",
+                   lambda b=bounds, n=size: pso(obj_func, n, generations, b, **fixed), generations)
+
+def run_benchmarks(quick: bool=False, repeat: int=5) -> dict:
+    """
+    Executa todos os casos e mede tempo e pico de memória.
+    Args:
+        quick (bool): Se True, usa menos dimensões/tamanhos e gerações.
+        repeat (int): Rodadas de medição de tempo por caso (vale a menor).
+    Returns:
+        dict: Nome do caso -> {'seconds', 'peak_bytes', 'per_unit_seconds'}.
+    """
+    results = {}
+    cases = list(objective_cases(quick)) + list(engine_cases(quick))
+    for name, func, units in cases:
+        with contextlib.redirect_stdout(io.StringIO()): # Silencia as mensagens de convergência do GA/PSO
+            result = _measure(func, repeat)
+        result['per_unit_seconds'] = result['seconds'] / units # Por ponto avaliado ou por geração
+        results[name] = result
+        print(f"{name:<45} {result['seconds'] * 1e3:10.3f} ms  {result['peak_bytes'] / 2**20:9.2f} MiB")
+    return results
+
+def environment() -> dict:
+    """ Identificação da máquina e da versão do código, guardada junto com os resultados. """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def load_history(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path) as file:
+        return json.load(file)
+
+def save_history(path: str, history: list):
+    """ Grava o histórico de forma atômica (arquivo temporário + rename). """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as file:
+        json.dump(history, file, indent=2)
+    os.replace(temp_path, path)
+
+def compare_runs(baseline: dict, current: dict, threshold: float=DEFAULT_THRESHOLD) -> list:
+    """
+    Compara duas execuções do histórico caso a caso.
+    Args:
+        baseline (dict): Execução de referência.
+        current (dict): Execução comparada.
+        threshold (float): Aumento relativo a partir do qual o caso é marcado como regressão (0.1 = 10%).
+    Returns:
+        list: Tuplas (caso, métrica, referência, atual, variação relativa, é regressão), só dos casos presentes nas duas.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        for metric in ('per_unit_seconds', 'peak_bytes'): # Tempo por ponto/geração: comparável entre 'quick' e completo
+            before, after = reference[metric], result[metric]
+            change = (after - before) / before if before else 0.0
+            rows.append((name, metric, before, after, change, change > threshold))
+    return rows
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks das funções objetivo, do GA e do PSO.")
+    parser.add_argument('--history', default=HISTORY_FILE, help="Arquivo JSON com o histórico de resultados.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Executa os benchmarks e acrescenta o resultado ao histórico.")
+    run_parser.add_argument('--quick', action='store_true', help="Versão reduzida dos casos.")
+    run_parser.add_argument('--repeat', type=int, default=5, help="Rodadas de medição por caso.")
+    run_parser.add_argument('--label', default=None, help="Descrição livre da execução.")
+
+    compare_parser = commands.add_parser('compare', help="Compara duas execuções do histórico.")
+    compare_parser.add_argument('--baseline', type=int, default=-2, help="Índice da execução de referência (padrão: penúltima).")
+    compare_parser.add_argument('--current', type=int, default=-1, help="Índice da execução comparada (padrão: última).")
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Aumento relativo tolerado (0.1 = 10%%).")
+    args = parser.parse_args(argv)
+
+    history = load_history(args.history)
+    if args.command == 'run':
+        entry = {**environment(), 'label': args.label, 'quick': args.quick,
+                 'results': run_benchmarks(quick=args.quick, repeat=args.repeat)}
+        history.append(entry)
+        save_history(args.history, history)
+        print(f"\nResultado salvo em '{args.history}' ({len(history)} execuções no histórico).")
+        return 0
+
+    if len(history) < 2:
+        print(f"São necessárias ao menos duas execuções em '{args.history}' para comparar.")
+        return 1
+    baseline, current = history[args.baseline], history[args.current]
+    print(f"Referência: {baseline['timestamp']} ({baseline['commit']})  |  Atual: {current['timestamp']} ({current['commit']})")
+    if baseline.get('quick') != current.get('quick') or baseline.get('cpu_count') != current.get('cpu_count'):
+        print("Aviso: as execuções usaram configurações ou máquinas diferentes; os números podem não ser comparáveis.")
+    rows = compare_runs(baseline, current, args.threshold)
+    regressions = [row for row in rows if row[5]]
+    for name, metric, before, after, change, is_regression in rows:
+        unit, scale = ('µs', 1e6) if metric == 'per_unit_seconds' else ('MiB', 1 / 2**20)
+        flag = '  <-- REGRESSÃO' if is_regression else ''
+        print(f"{name:<45} {metric:<16} {before * scale:10.3f} -> {after * scale:10.3f} {unit:<3} {change:+7.1%}{flag}")
+    print(f"\n{len(regressions)} regressões acima de {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import os
+import pickle
+import tempfile
+from time import perf_counter
+import numpy as np
+
+# ==============================================================================
+# CHECKPOINTS (RETOMADA DE EXECUÇÕES LONGAS E DE TUNINGS)
+# ==============================================================================
+# O estado completo de uma execução (população/partículas, velocidades, pbest, gbest,
+# estagnação, estado do gerador aleatório, contadores, histórico e métricas) é gravado
+# periodicamente em um único arquivo. Ao retomar com o mesmo checkpoint e os mesmos
+# parâmetros, a execução continua exatamente (bit a bit) de onde parou.
+# As gravações são atômicas: um processo interrompido no meio de uma gravação deixa o
+# checkpoint anterior intacto.
+
+CHECKPOINT_VERSION = 1 # Incrementar quando o formato do estado mudar
+DEFAULT_CHECKPOINT_INTERVAL = 5.0 # Segundos entre gravações
+
+def atomic_write(path, write):
+    """ Grava em um arquivo temporário e renomeia, para que outros processos nunca leiam um arquivo pela metade. """
+    directory = os.path.dirname(path) or '.'
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file:
+            write(file)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def save_checkpoint(path: str, state: dict):
+    """ Grava o estado de forma atômica (pickle em arquivo temporário + rename). """
+    payload = {'version': CHECKPOINT_VERSION, 'state': state}
+    atomic_write(path, lambda file: pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL))
+
+def load_checkpoint(path: str):
+    """
+    Returns:
+        dict | None: Estado gravado em 'path', ou None se não houver checkpoint.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as file:
+        payload = pickle.load(file)
+    if payload.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Checkpoint '{path}' tem versão {payload.get('version')}; esperada {CHECKPOINT_VERSION}.")
+    return payload['state']
+
+class Checkpointer:
+    """
+    Grava checkpoints em 'path' no máximo a cada 'interval' segundos.
+
+    Uso:
+        checkpointer = Checkpointer('runs/ga_d30.ckpt', interval=5.0)
+        state = checkpointer.load() # None se não houver checkpoint
+        ...
+        if checkpointer.due():
+            checkpointer.save(estado)
+        ...
+        checkpointer.remove() # Execução concluída
+    """
+    def __init__(self, path: str, interval: float=DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        Args:
+            path (str): Arquivo do checkpoint (o diretório é criado se não existir).
+            interval (float): Intervalo mínimo entre gravações, em segundos (0 = grava sempre).
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.interval = interval
+        self.saves = 0
+        self._last_save = perf_counter()
+
+    def due(self) -> bool:
+        """ Se já passou 'interval' desde a última gravação. """
+        return perf_counter() - self._last_save >= self.interval
+
+    def save(self, state: dict):
+        save_checkpoint(self.path, state)
+        self.saves += 1
+        self._last_save = perf_counter()
+
+    def load(self):
+        return load_checkpoint(self.path)
+
+    def remove(self):
+        """ Apaga o checkpoint (ex: ao final de uma execução concluída). """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+# ==============================================================================
+# ESTADO DOS OTIMIZADORES ASK/TELL (GA e PSO)
+# ==============================================================================
+
+def _config_value(value):
+    return np.asarray(value).tolist() # Arrays (ex: bounds) comparáveis com ==
+
+def optimizer_state(optimizer, fields: tuple, config_fields: tuple) -> dict:
+    """
+    Cópia do estado mutável de um otimizador ask/tell, incluindo o estado do gerador aleatório.
+    Args:
+        optimizer: Instância de GA ou PSO.
+        fields (tuple): Atributos que formam o estado da execução.
+        config_fields (tuple): Parâmetros que devem ser iguais para que o estado possa ser restaurado.
+    """
+    if optimizer._pending:
+        raise RuntimeError("Não é possível gravar o estado com um ask() aguardando tell().")
+    return {
+        'config': {name: _config_value(getattr(optimizer, name)) for name in config_fields},
+        'rng': optimizer.rng.bit_generator.state,
+        'fields': {name: np.copy(value) if isinstance(value, np.ndarray) else value
+                   for name, value in ((name, getattr(optimizer, name)) for name in fields)},
+    }
+
+def restore_optimizer_state(optimizer, state: dict, config_fields: tuple):
+    """ Restaura em 'optimizer' um estado gravado por optimizer_state (ValueError se os parâmetros diferirem). """
+    config = {name: _config_value(getattr(optimizer, name)) for name in config_fields}
+    if config != state['config']:
+        changed = sorted(name for name in config if config[name] != state['config'].get(name))
+        raise ValueError(f"O checkpoint foi gravado com outros parâmetros: {', '.join(changed)}.")
+    optimizer.rng.bit_generator.state = state['rng']
+    for name, value in state['fields'].items():
+        setattr(optimizer, name, np.copy(value) if isinstance(value, np.ndarray) else value)
+    optimizer._pending = False
+
+# ==============================================================================
+# ESTADO DE UMA EXECUÇÃO DE ga()/pso()
+# ==============================================================================
+
+def run_state(optimizer, recorder, run_store=None, run_id=None, metrics=None) -> dict:
+    """ Estado completo de uma execução de ga()/pso(): otimizador, histórico, armazenamento e métricas. """
+    return {
+        'optimizer': optimizer.state_dict(),
+        'history': recorder.state_dict(),
+        'run_id': run_id,
+        'run_store_rows': None if run_store is None else run_store.rows,
+        'metrics': None if metrics is None else metrics.state_dict(),
+    }
+
+def restore_run_state(state: dict, optimizer, recorder, run_store=None, metrics=None):
+    """
+    Restaura uma execução gravada por run_state. As linhas acrescentadas ao histórico em disco e ao
+    RunStore depois do checkpoint são descartadas, para não ficarem duplicadas.
+    Returns:
+        int | None: Número da execução no RunStore.
+    """
+    optimizer.load_state_dict(state['optimizer'])
+    recorder.load_state_dict(state['history'])
+    run_id = state['run_id']
+    if run_store is not None:
+        if state['run_store_rows'] is None:
+            raise ValueError("O checkpoint foi gravado sem RunStore.")
+        run_store.truncate(state['run_store_rows'])
+    if metrics is not None:
+        if state['metrics'] is None:
+            raise ValueError("O checkpoint foi gravado sem RunMetrics.")
+        metrics.load_state_dict(state['metrics'])
+    return run_id
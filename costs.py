@@ -0,0 +1,89 @@
+# ==============================================================================
+# MODELO ESTÁTICO DE CUSTO DAS OPERAÇÕES
+# ==============================================================================
+# Cada função objetivo e cada operador declara aqui, uma única vez, quantas
+# multiplicações e divisões custa por unidade de trabalho (por ponto avaliado,
+# por gene cruzado, por partícula atualizada...). Os totais são derivados das
+# contagens de avaliações/iterações, sem incrementar contadores nos laços.
+
+def rastrigin_cost(dim):
+    """ Operações por ponto avaliado da Rastrigin em D dimensões. """
+    return {
+        'multiplications': 3 * dim, # x^2, 2*pi*x, A*cos por coordenada
+        'divisions': dim, # Fator de escala por coordenada
+    }
+
+def schwefel_rosenbrock_cost(dim):
+    """ Operações por ponto avaliado da Schwefel-Rosenbrock em D dimensões. """
+    return {
+        # Schwefel (D) + Rosenbrock (4 por par) + x*25 (D) + Ackley (D + 3) + Schaffer (D + 2) + Fobj (1) + w4 (2)
+        'multiplications': dim + 4 * (dim - 1) + dim + (dim + 3) + (dim + 2) + 1 + 2,
+        # Sqrt (1) + escala do Rosenbrock (D) + Ackley (2) + Schaffer (1)
+        'divisions': 1 + dim + 2 + 1,
+    }
+
+def ackley_cost(dim):
+    """ Operações por ponto avaliado da Ackley em D dimensões. """
+    return {
+        'multiplications': 2 * dim + 2, # x^2 e 2*pi*x por coordenada, -0.2*sqrt e -20*exp
+        'divisions': 2, # Médias dos quadrados e dos cossenos
+    }
+
+def griewank_cost(dim):
+    """ Operações por ponto avaliado da Griewank em D dimensões. """
+    return {
+        'multiplications': 2 * dim, # x^2 e produtório dos cossenos por coordenada
+        'divisions': dim + 1, # x / sqrt(i) por coordenada e soma / 4000
+    }
+
+def schwefel_cost(dim):
+    """ Operações por ponto avaliado da Schwefel em D dimensões. """
+    return {
+        'multiplications': dim + 1, # x * sin(sqrt|x|) por coordenada e 418.98 * D
+        'divisions': 0,
+    }
+
+def rosenbrock_cost(dim):
+    """ Operações por ponto avaliado da Rosenbrock em D dimensões. """
+    return {
+        'multiplications': 4 * (dim - 1), # x^2, (.)^2, 100*(.) e (1-x)^2 por par
+        'divisions': 0,
+    }
+
+OBJECTIVE_COSTS = {
+    'rastrigin': rastrigin_cost,
+    'schwefel_rosenbrock': schwefel_rosenbrock_cost,
+    'ackley': ackley_cost,
+    'griewank': griewank_cost,
+    'schwefel': schwefel_cost,
+    'rosenbrock': rosenbrock_cost,
+}
+
+# Operadores do GA, por unidade indicada no comentário
+GA_COSTS = {
+    'selection': {'divisions': 1}, # Probabilidade de seleção, por indivíduo e geração
+    'crossover': {'multiplications': 2}, # alpha * d nos dois limites do BLX, por gene cruzado
+    'mutation': {'multiplications': 1}, # Ruído gaussiano, por gene mutado
+}
+
+def pso_update_cost(dim):
+    """ Operações do PSO por partícula e iteração em D dimensões. """
+    return {
+        'multiplications': 5 * dim, # Cognitivo (2), social (2) e inércia (1) por coordenada
+        'divisions': 1, # Peso da inércia decrescente
+    }
+
+def operation_totals(unit_costs: dict, counts: dict) -> dict:
+    """
+    Deriva o total de operações a partir dos custos unitários declarados.
+    Args:
+        unit_costs (dict): Custo por unidade de cada item, ex: GA_COSTS.
+        counts (dict): Quantas unidades de cada item foram executadas.
+    Returns:
+        dict: Total de 'multiplications' e 'divisions'.
+    """
+    totals = {'multiplications': 0, 'divisions': 0}
+    for item, count in counts.items():
+        for operation, cost in unit_costs[item].items():
+            totals[operation] += cost * count
+    return totals
@@ -0,0 +1,98 @@
+import numpy as np
+from collections import OrderedDict
+from function import ObjectiveFunction
+
+class CachedObjective:
+    """
+    Cache de avaliações (memoização) em volta de uma ObjectiveFunction.
+
+    Pontos já avaliados (ex: elites do GA copiados sem alteração, pais que não
+    sofreram crossover nem mutação) são respondidos pelo cache, sem chamar a função
+    objetivo. A chave é a coordenada exata do ponto ou, se 'decimals' for informado,
+    a coordenada arredondada (quantizada). O cache tem tamanho máximo e descarta
+    primeiro as entradas usadas há mais tempo (LRU).
+
+    Pode ser passado no lugar da ObjectiveFunction para ga() e pso():
+        obj_func = CachedObjective(ObjectiveFunction('rastrigin'), max_size=50_000)
+
+    Os contadores 'evaluations', 'multiplications' e 'divisions' refletem apenas as
+    avaliações reais (misses); os acertos do cache ficam em 'cache_hits'.
+    """
+    def __init__(self, obj_func: ObjectiveFunction, max_size: int=100_000, decimals: int=None):
+        """
+        Args:
+            obj_func (ObjectiveFunction): Função objetivo a ser memoizada.
+            max_size (int): Número máximo de pontos guardados no cache.
+            decimals (int): Casas decimais para quantizar as coordenadas da chave. None usa a coordenada exata.
+        """
+        self.obj_func = obj_func
+        self.max_size = max_size
+        self.decimals = decimals
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+
+    @property
+    def target_func(self):
+        return self.obj_func.target_func
+
+    @property
+    def evaluations(self):
+        return self.obj_func.evaluations
+
+    @property
+    def multiplications(self):
+        return self.obj_func.multiplications
+
+    @property
+    def divisions(self):
+        return self.obj_func.divisions
+
+    def __call__(self, X, Y):
+        """ Chamada 2-D f(X, Y), no mesmo formato da ObjectiveFunction. """
+        return self.evaluate(np.stack((X, Y), axis=-1))
+
+    def evaluate(self, P):
+        """
+        Avalia um lote de pontos (..., D), consultando o cache antes da função objetivo.
+        Os pontos ausentes do cache são avaliados juntos, em uma única chamada vetorizada.
+        """
+        P = np.asarray(P, dtype=float)
+        batch_shape = P.shape[:-1]
+        points = P.reshape(-1, P.shape[-1])
+        keys_source = points if self.decimals is None else np.round(points, self.decimals) + 0.0 # +0.0 unifica -0.0 e 0.0
+        keys = [row.tobytes() for row in np.ascontiguousarray(keys_source)]
+
+        result = np.empty(len(points))
+        missing = {} # Chave -> índices no lote que aguardam avaliação
+        for i, key in enumerate(keys):
+            value = self._cache.get(key)
+            if value is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                self._cache.move_to_end(key) # Marca como usado recentemente
+                result[i] = value
+                self.cache_hits += 1
+
+        if missing:
+            first_indices = [indices[0] for indices in missing.values()]
+            values = self.obj_func.evaluate(points[first_indices])
+            self.cache_misses += len(first_indices)
+            self.cache_hits += sum(len(indices) - 1 for indices in missing.values()) # Repetidos dentro do lote
+            for (key, indices), value in zip(missing.items(), values):
+                result[indices] = value
+                self._cache[key] = value
+            while len(self._cache) > self.max_size: # Eviction LRU
+                self._cache.popitem(last=False)
+
+        return result.reshape(batch_shape)
+
+    def reset(self):
+        """ Reseta os contadores (o conteúdo do cache é mantido). """
+        self.obj_func.reset()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def clear(self):
+        """ Esvazia o cache. """
+        self._cache.clear()
@@ -1,116 +1,108 @@
 import numpy as np
+from objectives import get_objective
 
 class ObjectiveFunction:
     """
-    Classe que representa uma função objetivo.
-    Limites de entrada esperados: [-500, 500] para ambas.
-    
+    Classe que representa uma função objetivo do registro em objectives.py.
+    Aceita tanto a chamada 2-D f(X, Y) quanto lotes (N, D) via f.evaluate(P).
+
     Suporta:
-    - 'schwefel_rosenbrock': Soma completa (Original Scilab)
+    - 'schwefel_rosenbrock': Soma completa (Original Scilab), em [-500, 500]
     - 'rastrigin': Função clássica, adaptada para receber entrada [-500, 500]
+    - 'ackley', 'griewank', 'schwefel', 'rosenbrock': benchmarks clássicos, nos seus limites usuais
+    Os limites declarados e o ótimo conhecido de cada função estão em bounds() e optimum().
     """
-    def __init__(self, target_func='schwefel_rosenbrock'):
+    def __init__(self, target_func='schwefel_rosenbrock', count_ops=True):
+        """
+        Args:
+            target_func (str): Nome da função objetivo (ValueError se não estiver no registro).
+            count_ops (bool): Se False, não contabiliza multiplicações/divisões (caminho mais rápido).
+        """
         self.evaluations = 0
-        self.multiplications = 0
-        self.divisions = 0
         self.target_func = target_func
+        self.count_ops = count_ops
+        # A implementação é resolvida uma única vez, sem desvios por nome a cada chamada
+        self.objective = get_objective(target_func)
+        self._kernel = self.objective.kernel
+        self._cost = self.objective.cost
+        self._workspace = {} # Buffers de trabalho do kernel, reaproveitados entre chamadas
+        self._points_by_dim = {} # Pontos avaliados por dimensão, de onde derivam os totais de operações
+
+    @property
+    def multiplications(self):
+        return self.operations()['multiplications']
+
+    @property
+    def divisions(self):
+        return self.operations()['divisions']
+
+    def operations(self) -> dict:
+        """ Total de multiplicações e divisões, derivado do modelo de custo em costs.py. """
+        totals = {'multiplications': 0, 'divisions': 0}
+        for dim, num_points in self._points_by_dim.items():
+            for operation, cost in self._cost(dim).items():
+                totals[operation] += cost * num_points
+        return totals
+
+    def _count(self, num_elements, dim):
+        self.evaluations += num_elements
+        if self.count_ops:
+            self._points_by_dim[dim] = self._points_by_dim.get(dim, 0) + num_elements
 
     def __call__(self, X, Y):
         """
-        Calcula o valor da função.
+        Calcula o valor da função em 2-D (usado principalmente nos gráficos).
         Args:
-            X, Y: Arrays numpy com coordenadas. Esperado intervalo [-500, 500].
+            X, Y: Arrays numpy com coordenadas, dentro de bounds(2).
         """
-        num_elements = np.size(X)
-        self.evaluations += num_elements
-
-        # ==============================================================================
-        # ========================== FUNÇÃO RASTRIGIN ==================================
-        # ==============================================================================
-        if self.target_func == 'rastrigin':
-            # A Rastrigin padrão opera em [-5.12, 5.12].
-            # Como o GA/PSO vai enviar valores em [-500, 500], precisamos comprimir
-            # a entrada para manter a geometria correta da função.
-            
-            # Fator de escala: 5.12 / 500 = 0.01024
-            scale_factor = 5.12 / 500.0
-            
-            X_scaled = X * scale_factor
-            Y_scaled = Y * scale_factor
-            
-            self.divisions += 2 * num_elements # Contabiliza a divisão do fator de escala
-            
-            A = 10
-            # Parte X
-            comp_x = X_scaled**2 - A * np.cos(2 * np.pi * X_scaled)
-            self.multiplications += 3 * num_elements # x^2, 2*pi*x, A*cos
-            
-            # Parte Y
-            comp_y = Y_scaled**2 - A * np.cos(2 * np.pi * Y_scaled)
-            self.multiplications += 3 * num_elements 
-            
-            result = 2 * A + comp_x + comp_y
-            
-            return result
+        # X e Y são copiados direto nas linhas do buffer (2, N), sem empilhar
+        shape = np.broadcast(X, Y).shape
+        num_elements = int(np.prod(shape))
+        self._count(num_elements, 2)
+        coords = self._coords(num_elements, 2)
+        coords[0] = np.broadcast_to(X, shape).ravel()
+        coords[1] = np.broadcast_to(Y, shape).ravel()
+        return self._kernel(coords, self._workspace).reshape(shape)
 
-        # ==============================================================================
-        # ========================= (Schwefel-Rosenbrock) ==============================
-        # ==============================================================================
-        # Esta função foi desenhada para operar nativamente em [-500, 500]
-        # Devido ao componente Schwefel (Z_func).
-        
-        # Componente Z (Schwefel)
-        Z_func = -X * np.sin(np.sqrt(np.abs(X))) - Y * np.sin(np.sqrt(np.abs(Y)))
-        self.multiplications += 2 * num_elements
-        self.divisions += np.size(X) # Sqrt
+    def evaluate(self, P):
+        """
+        Calcula o valor da função para um lote de pontos em D dimensões, sem fatiar as colunas.
+        Args:
+            P: Array numpy (..., D) com os pontos, dentro de bounds(D).
+        Returns:
+            Array numpy (...) com o valor da função em cada ponto.
+        """
+        P = np.asarray(P, dtype=float)
+        dim = P.shape[-1]
+        num_elements = P.size // dim # Número de pontos avaliados
+        self._count(num_elements, dim)
 
-        # Reescalonamento interno das variáveis para Rosenbrock
-        X_scaled = X / 250.0
-        Y_scaled = Y / 250.0
-        self.divisions += 2 * num_elements
-        
-        # Componente R (Rosenbrock)
-        R_func = 100 * (Y_scaled - X_scaled**2)**2 + (1 - X_scaled)**2
-        self.multiplications += 4 * num_elements
+        # As coordenadas são transpostas para (D, N): cada coordenada vira uma linha contígua e
+        # as somas sobre as dimensões viram somas de linhas inteiras.
+        coords = self._coords(num_elements, dim)
+        np.copyto(coords, P.reshape(num_elements, dim).T)
+        return self._kernel(coords, self._workspace).reshape(P.shape[:-1])
 
-        # w1 = Rosenbrock + Schwefel
-        w1_val = R_func + Z_func
-        
-        # Cálculos para W4 (Ackley/Schaffer mix)
-        x1 = 25 * X_scaled
-        x2 = 25 * Y_scaled
-        self.multiplications += 2 * num_elements
+    def _coords(self, num_elements, dim):
+        """ Buffer (D, N) das coordenadas, reaproveitado enquanto o shape do lote não muda. """
+        coords = getattr(self, '_coords_buffer', None)
+        if coords is None or coords.shape != (dim, num_elements):
+            coords = self._coords_buffer = np.empty((dim, num_elements))
+        return coords
 
-        a = 500
-        b = 0.1
-        c = 0.5 * np.pi
-        
-        # Componente F10 (Ackley)
-        F10 = -a * np.exp(-b * np.sqrt((x1**2 + x2**2) / 2)) - \
-            np.exp((np.cos(c * x1) + np.cos(c * x2)) / 2) + np.exp(1)
-        self.multiplications += 5 * num_elements
-        self.divisions += 2 * num_elements
+    def bounds(self, dim: int=2) -> tuple:
+        """ Limites declarados da função, como arrays (D,) no formato de ga()/pso(). """
+        return self.objective.bounds(dim)
 
-        # Componente zsh (Schaffer)
-        epsilon = 1e-9
-        zsh_numerator = (np.sin(np.sqrt(x1**2 + x2**2)))**2 - 0.5
-        zsh_denominator = (1 + 0.1 * (x1**2 + x2**2))**2
-        zsh = 0.5 - zsh_numerator / (zsh_denominator + epsilon)
-        self.multiplications += 4 * num_elements
-        self.divisions += 1 * num_elements
-        
-        # Fobj
-        Fobj = F10 * zsh
-        self.multiplications += num_elements
+    def optimum(self, dim: int=2) -> tuple:
+        """ Posição e valor do ótimo global conhecido (não conta como avaliação). """
+        return self.objective.optimum(dim)
 
-        # w4
-        w4_val = np.sqrt(R_func**2 + Z_func**2) + Fobj
-        self.multiplications += 2 * num_elements
-        
-        return w1_val + w4_val # Retorna a soma completa
+    def is_success(self, fitness, dim: int=2, tolerance: float=1e-4):
+        """ Indica se o fitness chegou a 'tolerance' do ótimo conhecido. """
+        return self.objective.is_success(fitness, dim, tolerance)
 
     def reset(self):
         """ Reseta os contadores. """
         self.evaluations = 0
-        self.multiplications = 0
-        self.divisions = 0
\ No newline at end of file
+        self._points_by_dim = {}
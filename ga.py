@@ -1,51 +1,116 @@
 from function import ObjectiveFunction
+from history import HistoryRecorder
+from run_store import RunStore
+from metrics import RunMetrics
+from profiling import IterationState, make_timer, NULL_TIMER
+from checkpoint import (Checkpointer, DEFAULT_CHECKPOINT_INTERVAL, optimizer_state,
+                        restore_optimizer_state, run_state, restore_run_state)
+from costs import GA_COSTS, operation_totals
 import numpy as np
 
-def ga(obj_func: ObjectiveFunction, num_individuals: int, max_generations: int,
-        bounds: tuple, crossover_rate: float=0.9, mutation_rate: float=0.5,
-        mutation_strength: float=1.0, elitism_size: int=1, tolerance: float=1e-6,
-        patience: int=10) -> tuple:
+class GA:
     """
-    Algoritmo Genético para otimização de uma função objetivo.
-    Args:
-        obj_func (ObjectiveFunction): Instância da função objetivo a ser minimizada.
-        num_individuals (int): Número de indivíduos na população.
-        max_generations (int): Número máximo de gerações.
-        bounds (tuple): Limites inferior e superior para os indivíduos.
-        crossover_rate (float): Taxa de crossover.
-        mutation_rate (float): Taxa de mutação.
-        mutation_strength (float): Força da mutação.
-        elitism_size (int): Número de indivíduos a serem mantidos na próxima geração (elitismo).
-        tolerance (float): Tolerância para considerar convergência.
-        patience (int): Número de gerações sem melhoria antes de parar.
-    Returns:
-        tuple: Melhor indivíduo encontrado, seu valor de fitness, histórico da população e histórico de fitness e contador de operações.
+    Algoritmo Genético com interface ask/tell: o estado da execução fica no objeto e a
+    avaliação da função objetivo fica a cargo de quem o usa (ex: um avaliador que junta,
+    em um único lote, as populações de várias execuções; ver ask_tell.py).
+
+    Uso:
+        optimizer = GA(50, bounds, max_generations=200, rng=seed)
+        while not optimizer.stopped:
+            population = optimizer.ask() # Bloco (N, D) a ser avaliado
+            optimizer.tell(obj_func.evaluate(population)) # Fitness (N,), na mesma ordem
+
+    O primeiro ask() devolve a população inicial e os seguintes, a próxima geração. A ordem
+    dos sorteios é a mesma de ga(), que é apenas este laço: mesma semente, mesmo resultado.
     """
-    
-    # --- INICIALIZAÇÃO ---
-    population = np.random.uniform(bounds[0], bounds[1], (num_individuals, 2)) # Cria a população inicial com indivíduos aleatórios
-    fitness = obj_func(population[:, 0], population[:, 1]) # Avalia a população inicial
-    counter = {'multiplications': 0, 'divisions': 0} # Contador de operações
-    
-    # --- HISTÓRICO ---
-    population_history = [population.copy()] # Armazena o histórico da população
-    fitness_history = [fitness.copy()] # Armazena o histórico de fitness
-    
-    # Inicializa o melhor global
-    best_overall_fitness = np.inf
-    best_overall_individual = None
+    # Estado da execução gravado nos checkpoints e parâmetros que precisam coincidir para retomá-la
+    _STATE_FIELDS = ('population', 'fitness', 'generation', 'evaluations', 'crossed_pairs', 'mutated_genes',
+                     'best_fitness', 'best_individual', 'stagnation_counter', 'last_best_fitness')
+    _CONFIG_FIELDS = ('num_individuals', 'bounds', 'crossover_rate', 'mutation_rate', 'mutation_strength',
+                      'elitism_size', 'tolerance', 'patience', 'max_generations', 'count_ops')
 
-    # Variáveis para rastrear a estagnação
-    stagnation_counter = 0
-    last_overall_best_fitness = np.inf
+    def __init__(self, num_individuals: int, bounds: tuple, crossover_rate: float=0.9, mutation_rate: float=0.5,
+                 mutation_strength: float=1.0, elitism_size: int=1, tolerance: float=1e-6, patience: int=10,
+                 max_generations: int=None, rng=None, count_ops: bool=True, timer=NULL_TIMER):
+        """
+        Args:
+            num_individuals (int): Número de indivíduos na população.
+            bounds (tuple): Limites inferior e superior para os indivíduos. O tamanho dos limites define a dimensão D.
+            crossover_rate (float): Taxa de crossover.
+            mutation_rate (float): Taxa de mutação.
+            mutation_strength (float): Força da mutação.
+            elitism_size (int): Número de indivíduos a serem mantidos na próxima geração (elitismo).
+            tolerance (float): Tolerância para considerar convergência.
+            patience (int): Número de gerações sem melhoria antes de parar.
+            max_generations (int): Número máximo de gerações. None: sem limite (para apenas pela paciência).
+            rng (np.random.Generator | int | None): Gerador de números aleatórios ou semente.
+            count_ops (bool): Se False, não contabiliza multiplicações/divisões dos operadores.
+            timer (PhaseTimer): Cronômetro das fases (ver profiling.py). Padrão: desativado.
+        """
+        self.num_individuals = num_individuals
+        self.bounds = bounds
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.mutation_strength = mutation_strength
+        self.elitism_size = elitism_size
+        self.tolerance = tolerance
+        self.patience = patience
+        self.max_generations = max_generations
+        self.count_ops = count_ops
+        self.timer = timer
+        self.rng = np.random.default_rng(rng) # Aceita um Generator pronto ou uma semente
+        self.dim = len(bounds[0]) # Dimensão do espaço de busca, definida pelos limites
 
-    # --- CICLO EVOLUTIVO ---
-    stagnation_reached = False
-    for generation in range(max_generations):
+        self.population = None # Última população entregue por ask()
+        self.fitness = None # Fitness da última população avaliada
+        self.generation = -1 # Última geração avaliada (0 = população inicial)
+        self.evaluations = 0
+        self.crossed_pairs = 0 # Pares que sofreram crossover (o custo das operações é derivado no final)
+        self.mutated_genes = 0 # Genes que sofreram mutação
+
+        # Melhor global
+        self.best_fitness = np.inf
+        self.best_individual = None
+
+        # Variáveis para rastrear a estagnação
+        self.stagnation_counter = 0
+        self.last_best_fitness = np.inf
+        self._pending = False # Se há um ask() aguardando o tell() correspondente
+
+    @property
+    def stagnated(self) -> bool:
+        return self.generation > 0 and self.stagnation_counter >= self.patience # Só verificado após uma geração
+
+    @property
+    def stopped(self) -> bool:
+        """ Se a execução terminou, por estagnação ou por atingir o número máximo de gerações. """
+        return self.stagnated or (self.max_generations is not None and self.generation >= self.max_generations)
+
+    def ask(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Bloco (N, D) com os indivíduos a serem avaliados. Não deve ser modificado.
+        """
+        if self._pending:
+            raise RuntimeError("ask() chamado novamente antes do tell() da população anterior.")
+        self._pending = True
+        rng = self.rng
+        bounds = self.bounds
+        num_individuals = self.num_individuals
+        elitism_size = self.elitism_size
+        timer = self.timer
+
+        if self.fitness is None:
+            self.population = rng.uniform(bounds[0], bounds[1], (num_individuals, self.dim)) # Cria a população inicial com indivíduos aleatórios
+            timer.lap('initialization')
+            return self.population
+
+        population = self.population
+        fitness = self.fitness
 
         # --- ELITISMO ---
         elite_indices = np.argsort(fitness)[:elitism_size] # Seleciona os 'elitism_size' melhores indivíduos
-        new_population = [population[i].copy() for i in elite_indices] # A nova população começa com os indivíduos de elite
+        elite_population = population[elite_indices] # Os indivíduos de elite passam intactos para a próxima geração
 
         # --- SELEÇÃO POR ROLETA ---
         # Aptidão é a função objetivo avaliada e ordenada de forma que os melhores indivíduos tenham maior chance de serem selecionados
@@ -57,12 +122,11 @@ def ga(obj_func: ObjectiveFunction, num_individuals: int, max_generations: int,
         total_aptitude = np.sum(rank_aptitude) # Soma das aptidões
     
         selection_probabilities = rank_aptitude / total_aptitude
-        counter['divisions'] += num_individuals # Contabiliza as divisões
 
         final_probabilities = np.zeros(num_individuals) # Inicializa as probabilidades finais
         final_probabilities[ranked_indices] = selection_probabilities # Atribui as probabil
         
-        parent_indices = np.random.choice( # Sorteia com base nas probabilidades de seleção
+        parent_indices = rng.choice( # Sorteia com base nas probabilidades de seleção
             a=num_individuals,
             # a=non_elite_num_ind, # Sem elite
             size=num_parents_to_select,
@@ -72,92 +136,216 @@ def ga(obj_func: ObjectiveFunction, num_individuals: int, max_generations: int,
 
         mating_pool = population[parent_indices] # Cria o pool de pais selecionados
         # mating_pool = non_elite_population[parent_indices] # Sem elite
+        timer.lap('selection')
 
         # --- BLEND CROSSOVER (BLX-⍺) ---
-        i = 0
+        # Vetorizado: todos os pares (0,1), (2,3), ... do pool são cruzados de uma só vez
         alpha = 0.5 # Fator de mistura
-        while len(new_population) < num_individuals: # Enquanto a nova população não estiver completa
-            parent1 = mating_pool[i]
-            if i + 1 >= len(mating_pool): # Condição de segurança para o último indivíduo em um pool de tamanho ímpar
-                new_population.append(parent1.copy())
-                break # Encerra o loop while
-                
-            parent2 = mating_pool[i+1]
-
-            if np.random.rand() < crossover_rate:
-                child1 = np.zeros_like(parent1) # Arrays que receberão os genes dos filhos
-                child2 = np.zeros_like(parent2)
-                
-                for j in range(len(parent1)): # Itera sobre cada gene (x, y)
-                    d = np.abs(parent1[j] - parent2[j])
-                    min_val = min(parent1[j], parent2[j]) - alpha * d
-                    max_val = max(parent1[j], parent2[j]) + alpha * d
-                    counter['multiplications'] += 2 # Contabiliza as multiplicações
-                    
-                    new_gene1 = np.random.uniform(min_val, max_val)
-                    new_gene2 = np.random.uniform(min_val, max_val)
-                    
-                    child1[j] = np.clip(new_gene1, bounds[0][j], bounds[1][j])
-                    child2[j] = np.clip(new_gene2, bounds[0][j], bounds[1][j])
-
-                new_population.append(child1) # Adiciona o primeiro filho à nova população
-                if len(new_population) < num_individuals: # Verifica se ainda há espaço para o segundo filho
-                    new_population.append(child2) # Adiciona o segundo filho à nova população
-            else:
-                new_population.append(parent1.copy()) # Se não houver crossover, os pais sobrevivem
-                if len(new_population) < num_individuals:
-                    new_population.append(parent2.copy())
-            # --- DEBUG ---
-            # print(f"P1: ({parent1[0]:.2f}, {parent1[1]:.2f}) ; P2: ({parent2[0]:.2f}, {parent2[1]:.2f})   ->   C1: ({new_population[-2][0]:.2f}, {new_population[-2][1]:.2f}) , ({new_population[-1][0] if len(new_population) % 2 == 0 else 'N/A':.2f}, {new_population[-1][1] if len(new_population) % 2 == 0 else 'N/A':.2f})")
-            # --- FIM DEBUG ---
-
-            
-            i += 2 # Avança para o próximo par de pais
-        
-        population = np.array(new_population)
+        num_pairs = len(mating_pool) // 2
+        parents1 = mating_pool[0:2 * num_pairs:2]
+        parents2 = mating_pool[1:2 * num_pairs:2]
+
+        crossover_mask = rng.random(num_pairs) < self.crossover_rate # Pares que sofrem crossover
+        d = np.abs(parents1 - parents2)
+        min_val = np.minimum(parents1, parents2) - alpha * d
+        max_val = np.maximum(parents1, parents2) + alpha * d
+        if self.count_ops:
+            self.crossed_pairs += int(np.count_nonzero(crossover_mask))
+
+        children1 = rng.uniform(min_val, max_val)
+        children2 = rng.uniform(min_val, max_val)
+        children1 = np.where(crossover_mask[:, None], np.clip(children1, bounds[0], bounds[1]), parents1) # Sem crossover, os pais sobrevivem
+        children2 = np.where(crossover_mask[:, None], np.clip(children2, bounds[0], bounds[1]), parents2)
+
+        population = np.empty((num_individuals, self.dim))
+        population[:elitism_size] = elite_population # A nova população começa com os indivíduos de elite
+        offspring = population[elitism_size:elitism_size + 2 * num_pairs]
+        offspring[0::2] = children1 # Filhos intercalados, na mesma ordem dos pares
+        offspring[1::2] = children2
+        if len(mating_pool) % 2 == 1: # Último indivíduo de um pool de tamanho ímpar passa direto
+            population[-1] = mating_pool[-1]
+        timer.lap('crossover')
 
         # --- MUTAÇÃO ---
         mutation_candidates = population[elitism_size:] # Todos os indivíduos exceto os de elite
-        mask = np.random.rand(*mutation_candidates.shape) < mutation_rate
-        mutation_candidates[mask] += np.random.normal(0, mutation_strength, size=mutation_candidates[mask].shape)
-        num_mutations = np.sum(mask)
-        counter['multiplications'] += num_mutations
+        mask = rng.random(mutation_candidates.shape) < self.mutation_rate
+        num_mutations = int(np.sum(mask))
+        mutation_candidates[mask] += rng.normal(0, self.mutation_strength, size=num_mutations)
+        self.mutated_genes += num_mutations
+        timer.lap('mutation')
 
-        cliped_population = np.clip(population, bounds[0], bounds[1]) # Garante que os indivíduos estejam dentro dos limites
-        
-        population = cliped_population
+        np.clip(population, bounds[0], bounds[1], out=population) # Garante que os indivíduos estejam dentro dos limites
+        timer.lap('clipping')
 
-        fitness = obj_func(population[:, 0], population[:, 1])
-        # print(f"z: {fitness}")
+        self.population = population
+        return population
+
+    def tell(self, fitness: np.ndarray):
+        """
+        Recebe o fitness da população entregue pelo último ask() e avança o estado.
+        Args:
+            fitness (np.ndarray): Fitness (N,) de cada indivíduo, na ordem de ask().
+        """
+        if not self._pending:
+            raise RuntimeError("tell() chamado sem um ask() pendente.")
+        fitness = np.asarray(fitness, dtype=float)
+        if fitness.shape != (self.num_individuals,):
+            raise ValueError(f"Fitness com shape {fitness.shape}; esperado ({self.num_individuals},).")
+        self._pending = False
+        self.fitness = fitness
+        self.generation += 1
+        self.evaluations += self.num_individuals
+        if self.generation == 0: # A população inicial não entra no melhor global
+            return
 
         # --- ATUALIZAÇÃO DO MELHOR GLOBAL ---
         current_best_index = np.argmin(fitness)
-        if fitness[current_best_index] < best_overall_fitness:
-            best_overall_fitness = fitness[current_best_index]
-            best_overall_individual = population[current_best_index].copy()
-        
-        population_history.append(population.copy()) # Armazena o estado atual da população
-        fitness_history.append(fitness.copy())
-        # print(f"{generation + 1}, {fitness}")
-        
+        if fitness[current_best_index] < self.best_fitness:
+            self.best_fitness = fitness[current_best_index]
+            self.best_individual = self.population[current_best_index].copy()
+
         # --- PARADA POR TOLERÂNCIA ---
-        improvement = last_overall_best_fitness - best_overall_fitness
-        if improvement > tolerance: # Se houve melhoria significativa
-            stagnation_counter = 0
+        improvement = self.last_best_fitness - self.best_fitness
+        if improvement > self.tolerance: # Se houve melhoria significativa
+            self.stagnation_counter = 0
         else:
-            stagnation_counter += 1
+            self.stagnation_counter += 1
+        self.last_best_fitness = self.best_fitness # Para ser usado na próxima geração
+        self.timer.lap('best')
+
+    def state_dict(self) -> dict:
+        """ Cópia do estado da execução (inclusive do gerador aleatório), para checkpoints. """
+        return optimizer_state(self, self._STATE_FIELDS, self._CONFIG_FIELDS)
+
+    def load_state_dict(self, state: dict):
+        """ Restaura um estado gravado por state_dict. ValueError se os parâmetros forem diferentes. """
+        restore_optimizer_state(self, state, self._CONFIG_FIELDS)
+
+    def result(self) -> tuple:
+        """ Melhor indivíduo encontrado e seu fitness, como retornados por ga(). """
+        return self.best_individual, self.best_fitness
+
+    def operation_counts(self) -> dict:
+        """ Contador de operações dos operadores (modelo de custo em costs.py) e NFE exato até aqui. """
+        counter = {'multiplications': 0, 'divisions': 0}
+        if self.count_ops:
+            counter = operation_totals(GA_COSTS, {
+                'selection': max(self.generation, 0) * self.num_individuals,
+                'crossover': self.crossed_pairs * self.dim, # Genes cruzados: D por par
+                'mutation': self.mutated_genes,
+            })
+        counter['evaluations'] = self.evaluations # NFE exato desta execução
+        return counter
+
+def ga(obj_func: ObjectiveFunction, num_individuals: int, max_generations: int,
+        bounds: tuple, crossover_rate: float=0.9, mutation_rate: float=0.5,
+        mutation_strength: float=1.0, elitism_size: int=1, tolerance: float=1e-6,
+        patience: int=10, history: str='full', history_every: int=1, history_capacity: int=None,
+        history_path: str=None, rng=None, count_ops: bool=True, run_store: RunStore=None,
+        metrics: RunMetrics=None, profile: bool=False, on_iteration=None, checkpoint_path: str=None,
+        checkpoint_interval: float=DEFAULT_CHECKPOINT_INTERVAL) -> tuple:
+    """
+    Algoritmo Genético para otimização de uma função objetivo (laço ask/avaliação/tell sobre a classe GA).
+    Args:
+        obj_func (ObjectiveFunction): Instância da função objetivo a ser minimizada.
+        num_individuals (int): Número de indivíduos na população.
+        max_generations (int): Número máximo de gerações.
+        bounds (tuple): Limites inferior e superior para os indivíduos. O tamanho dos limites define a dimensão D.
+        crossover_rate (float): Taxa de crossover.
+        mutation_rate (float): Taxa de mutação.
+        mutation_strength (float): Força da mutação.
+        elitism_size (int): Número de indivíduos a serem mantidos na próxima geração (elitismo).
+        tolerance (float): Tolerância para considerar convergência.
+        patience (int): Número de gerações sem melhoria antes de parar.
+        history (str): Modo do histórico: 'full', 'off', 'best', 'every' ou 'buffer' (ver HistoryRecorder).
+        history_every (int): Intervalo entre gerações armazenadas no modo 'every'.
+        history_capacity (int): Gerações comportadas pelo histórico pré-alocado. Padrão: max_generations + 1.
+        history_path (str): Prefixo dos arquivos .npy do histórico no modo 'memmap'.
+        rng (np.random.Generator | int | None): Gerador de números aleatórios ou semente (ex: np.random.Generator(np.random.PCG64DXSM(seed))).
+        count_ops (bool): Se False, não contabiliza multiplicações/divisões dos operadores.
+        run_store (RunStore): Armazenamento colunar onde o fitness de cada geração é acrescentado (ver run_store.py).
+        metrics (RunMetrics): Métricas atualizadas a cada geração, sem guardar histórico (ver metrics.py).
+        profile (bool): Se True, mede o tempo de cada fase e o devolve em counter['timings'] (ver profiling.py).
+        on_iteration (callable): Chamado ao final de cada geração com um IterationState. Se retornar True, a execução é interrompida.
+        checkpoint_path (str): Arquivo de checkpoint. Se existir, a execução é retomada dele (bit a bit); é gravado a cada 'checkpoint_interval' segundos e apagado ao final.
+        checkpoint_interval (float): Intervalo mínimo entre gravações do checkpoint, em segundos.
+    Returns:
+        tuple: Melhor indivíduo encontrado, seu valor de fitness, histórico da população e histórico de fitness e contador de operações (inclui 'evaluations', o NFE exato da execução, e 'timings', os segundos por fase, se profile=True).
+    """
+    
+    # --- INICIALIZAÇÃO ---
+    timer = make_timer(profile) # Cronômetro por fase (nulo se profile=False)
+    optimizer = GA(num_individuals, bounds, crossover_rate, mutation_rate, mutation_strength, elitism_size,
+                   tolerance, patience, max_generations, rng=rng, count_ops=count_ops, timer=timer)
+    checkpointer = None if checkpoint_path is None else Checkpointer(checkpoint_path, checkpoint_interval)
+    checkpoint = None if checkpointer is None else checkpointer.load()
+    recorder = HistoryRecorder(history, num_individuals, optimizer.dim, capacity=history_capacity or max_generations + 1,
+                               every=history_every, path=history_path, append=checkpoint is not None)
+    if checkpoint is not None: # Retoma a execução interrompida
+        run_id = restore_run_state(checkpoint, optimizer, recorder, run_store, metrics)
+        print(f"Execução retomada do checkpoint na geração {optimizer.generation}.")
+    else:
+        population = optimizer.ask() # População inicial
+        fitness = obj_func.evaluate(population) # Avalia a população inicial (N, D)
+        timer.lap('evaluation')
+        optimizer.tell(fitness)
+        
+        # --- HISTÓRICO ---
+        recorder.record(population, fitness) # Armazena a população e o fitness iniciais
+        run_id = None
+        if run_store is not None:
+            run_id = run_store.new_run()
+            run_store.record(run_id, 0, fitness)
+        if metrics is not None:
+            metrics.update(fitness, num_individuals)
+        timer.lap('history')
+
+    # --- CICLO EVOLUTIVO ---
+    stopped_by_callback = False
+    while not optimizer.stopped:
+        population = optimizer.ask() # Elitismo, seleção, crossover, mutação e clipping
+        fitness = obj_func.evaluate(population)
+        timer.lap('evaluation')
+        # print(f"z: {fitness}")
+        optimizer.tell(fitness) # Melhor global e estagnação
+        generation = optimizer.generation
         
-        if stagnation_counter >= patience: # Se acabou a paciência
-            stagnation_reached = True
-            last_overall_best_fitness = best_overall_fitness # Atualiza o melhor fitness para a próxima iteração
-            break
-            
-        last_overall_best_fitness = best_overall_fitness # Para ser usado na próxima iteração
+        recorder.record(population, fitness) # Armazena o estado atual da população
+        if run_store is not None:
+            run_store.record(run_id, generation, fitness)
+        if metrics is not None:
+            metrics.update(fitness, num_individuals)
+        timer.lap('history')
+        # print(f"{generation}, {fitness}")
+
+        # --- CALLBACK ---
+        if on_iteration is not None:
+            state = IterationState(generation, population, fitness, optimizer.best_individual, optimizer.best_fitness,
+                                   optimizer.stagnation_counter, optimizer.evaluations)
+            stopped_by_callback = bool(on_iteration(state))
+            timer.lap('callback')
+            if stopped_by_callback:
+                break
+
+        # --- CHECKPOINT ---
+        if checkpointer is not None and checkpointer.due():
+            checkpointer.save(run_state(optimizer, recorder, run_store, run_id, metrics))
+            timer.lap('checkpoint')
     
-    if stagnation_reached:
-        print(f"Convergência atingida na geração {generation + 1} devido à estagnação.")
+    if checkpointer is not None:
+        checkpointer.remove() # Execução concluída
+    if stopped_by_callback:
+        print(f"Execução interrompida pelo callback na geração {optimizer.generation}.")
+    elif optimizer.stagnated:
+        print(f"Convergência atingida na geração {optimizer.generation} devido à estagnação.")
     else:
         print(f"Número máximo de gerações ({max_generations}) atingido")
         
 
-    return best_overall_individual, best_overall_fitness, population_history, fitness_history, counter
\ No newline at end of file
+    # --- CONTAGEM DE OPERAÇÕES (modelo de custo em costs.py) ---
+    counter = optimizer.operation_counts()
+    if profile:
+        counter['timings'] = dict(timer.totals) # Segundos por fase
+
+    population_history, fitness_history = recorder.export()
+    return optimizer.best_individual, optimizer.best_fitness, population_history, fitness_history, counter
@@ -0,0 +1,215 @@
+import os
+import numpy as np
+
+HISTORY_MODES = ('full', 'off', 'best', 'every', 'buffer', 'memmap')
+NPY_HEADER_SIZE = 256 # Cabeçalho .npy reservado com folga para o shape crescer
+
+class NpyAppender:
+    """
+    Arquivo .npy que cresce por acréscimo (append-only) ao longo do primeiro eixo.
+    O cabeçalho tem tamanho fixo e é reescrito a cada acréscimo, de modo que o
+    arquivo é sempre um .npy válido e pode ser lido com np.load(..., mmap_mode='r').
+    """
+    def __init__(self, path: str, row_shape: tuple, dtype=np.float64, append: bool=False):
+        """
+        Args:
+            path (str): Caminho do arquivo .npy a ser criado (sobrescreve se existir).
+            row_shape (tuple): Shape de cada linha acrescentada (ex: (N, D)).
+            dtype: Tipo dos dados armazenados.
+            append (bool): Se True e o arquivo já existir, continua a partir das linhas existentes.
+        """
+        self.path = path
+        self.row_shape = tuple(row_shape)
+        self.dtype = np.dtype(dtype)
+        self.rows = 0
+        if append and os.path.exists(path):
+            self._file = open(path, 'rb+')
+            self.rows = self._read_rows()
+        else:
+            self._file = open(path, 'wb+')
+        self._write_header()
+
+    def _read_rows(self) -> int:
+        """ Lê o cabeçalho de um arquivo existente e confere se ele pode receber novas linhas. """
+        version = np.lib.format.read_magic(self._file)
+        if version != (1, 0):
+            self._file.close()
+            raise ValueError(f"'{self.path}' não foi gravado por NpyAppender (versão {version}).")
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(self._file)
+        if (self._file.tell() != NPY_HEADER_SIZE or fortran_order or dtype != self.dtype
+                or tuple(shape[1:]) != self.row_shape):
+            self._file.close()
+            raise ValueError(f"'{self.path}' não é compatível com shape {self.row_shape} e dtype {self.dtype}.")
+        return shape[0]
+
+    def _write_header(self):
+        header = {'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False,
+                  'shape': (self.rows,) + self.row_shape}
+        header_str = repr(header).encode('latin1')
+        # Magic (6) + versão (2) + tamanho do cabeçalho (2) + cabeçalho preenchido com espaços + '\n'
+        header_len = NPY_HEADER_SIZE - 10
+        if len(header_str) + 1 > header_len:
+            raise ValueError("Shape grande demais para o cabeçalho reservado do .npy.")
+        header_str = header_str.ljust(header_len - 1) + b'\n'
+        self._file.seek(0)
+        self._file.write(np.lib.format.MAGIC_PREFIX + bytes([1, 0]))
+        self._file.write(header_len.to_bytes(2, 'little'))
+        self._file.write(header_str)
+
+    def append(self, row: np.ndarray):
+        """ Acrescenta uma linha ao final do arquivo e atualiza o shape no cabeçalho. """
+        self._file.seek(0, 2)
+        self._file.write(np.ascontiguousarray(row, dtype=self.dtype).tobytes())
+        self.rows += 1
+        self._write_header()
+
+    def truncate(self, rows: int):
+        """ Descarta as linhas a partir de 'rows' (ex: gravadas depois de um checkpoint). """
+        if rows > self.rows:
+            raise ValueError(f"'{self.path}' tem {self.rows} linhas; não é possível voltar para {rows}.")
+        row_bytes = self.dtype.itemsize * int(np.prod(self.row_shape, dtype=np.int64))
+        self._file.truncate(NPY_HEADER_SIZE + rows * row_bytes)
+        self.rows = rows
+        self._write_header()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+def open_history(path: str) -> tuple:
+    """
+    Abre de forma preguiçosa (memory-mapped) um histórico gravado no modo 'memmap'.
+    Args:
+        path (str): Prefixo usado em 'history_path' na execução.
+    Returns:
+        tuple: Histórico da população (G, N, D) e histórico de fitness (G, N), como np.memmap somente leitura.
+    """
+    return (np.load(f"{path}_population.npy", mmap_mode='r'),
+            np.load(f"{path}_fitness.npy", mmap_mode='r'))
+
+class HistoryRecorder:
+    """
+    Armazena o histórico de população e fitness de uma execução do GA/PSO.
+
+    Modos:
+    - 'full': listas com uma cópia por geração (comportamento original)
+    - 'off': não guarda nada (ideal para o tuning)
+    - 'best': guarda apenas o melhor indivíduo e seu fitness em cada geração
+    - 'every': guarda uma geração a cada 'every' gerações
+    - 'buffer': buffer circular pré-alocado com as últimas 'capacity' gerações
+    - 'memmap': grava cada geração (ou uma a cada 'every') em arquivos .npy no disco
+    Os modos 'best', 'every' e 'buffer' escrevem em um único ndarray contíguo.
+    """
+    def __init__(self, mode: str, num_individuals: int, dim: int, capacity: int, every: int=1, path: str=None,
+                 append: bool=False):
+        """
+        Args:
+            mode (str): Um dos modos em HISTORY_MODES.
+            num_individuals (int): Número de indivíduos/partículas por geração.
+            dim (int): Dimensão do espaço de busca.
+            capacity (int): Número de gerações que o histórico deve comportar (ex: max_generations + 1).
+            every (int): Intervalo entre gerações armazenadas nos modos 'every' e 'memmap'.
+            path (str): Prefixo dos arquivos '<path>_population.npy' e '<path>_fitness.npy' no modo 'memmap'.
+            append (bool): No modo 'memmap', reabre os arquivos existentes em vez de sobrescrevê-los (retomada de checkpoint).
+        """
+        if mode not in HISTORY_MODES:
+            raise ValueError(f"Modo de histórico desconhecido: '{mode}'. Use um de {HISTORY_MODES}.")
+        if every < 1:
+            raise ValueError("'every' deve ser maior ou igual a 1.")
+
+        if mode == 'memmap' and path is None:
+            raise ValueError("O modo 'memmap' exige um caminho ('history_path').")
+
+        self.mode = mode
+        self.path = path
+        self.every = every if mode in ('every', 'memmap') else 1
+        self.generation = 0 # Número de gerações já recebidas
+        self.count = 0 # Número de gerações efetivamente armazenadas
+
+        if mode == 'full':
+            self._population = []
+            self._fitness = []
+        elif mode == 'memmap':
+            self._population = NpyAppender(f"{path}_population.npy", (num_individuals, dim), append=append)
+            self._fitness = NpyAppender(f"{path}_fitness.npy", (num_individuals,), append=append)
+        elif mode != 'off':
+            rows = 1 if mode == 'best' else num_individuals
+            slots = -(-capacity // self.every) # Divisão com arredondamento para cima
+            self._population = np.empty((slots, rows, dim))
+            self._fitness = np.empty((slots, rows))
+
+    def record(self, population: np.ndarray, fitness: np.ndarray):
+        """ Registra a população e o fitness da geração atual. """
+        generation = self.generation
+        self.generation += 1
+        if self.mode == 'off' or generation % self.every != 0:
+            return
+
+        if self.mode == 'full':
+            self._population.append(population.copy())
+            self._fitness.append(fitness.copy())
+        elif self.mode == 'memmap':
+            self._population.append(population)
+            self._fitness.append(fitness)
+        else:
+            slot = self.count % len(self._population) # No modo 'buffer', sobrescreve as gerações mais antigas
+            if self.mode == 'best':
+                best_index = np.argmin(fitness)
+                self._population[slot, 0] = population[best_index]
+                self._fitness[slot, 0] = fitness[best_index]
+            else:
+                self._population[slot] = population
+                self._fitness[slot] = fitness
+        self.count += 1
+
+    def state_dict(self) -> dict:
+        """ Cópia do histórico gravado até aqui, para checkpoints (no modo 'memmap', apenas o número de linhas). """
+        state = {'mode': self.mode, 'generation': self.generation, 'count': self.count}
+        if self.mode == 'full':
+            state['population'], state['fitness'] = list(self._population), list(self._fitness)
+        elif self.mode not in ('off', 'memmap'):
+            used = min(self.count, len(self._population))
+            state['population'], state['fitness'] = self._population[:used].copy(), self._fitness[:used].copy()
+        return state
+
+    def load_state_dict(self, state: dict):
+        """ Restaura um histórico gravado por state_dict (no modo 'memmap', descarta as linhas posteriores). """
+        if state['mode'] != self.mode:
+            raise ValueError(f"Histórico gravado no modo '{state['mode']}', não '{self.mode}'.")
+        self.generation = state['generation']
+        self.count = state['count']
+        if self.mode == 'full':
+            self._population, self._fitness = list(state['population']), list(state['fitness'])
+        elif self.mode == 'memmap':
+            self._population.truncate(self.count)
+            self._fitness.truncate(self.count)
+        elif self.mode != 'off':
+            used = len(state['population'])
+            self._population[:used] = state['population']
+            self._fitness[:used] = state['fitness']
+
+    def export(self) -> tuple:
+        """
+        Returns:
+            tuple: Histórico da população e histórico de fitness, em ordem cronológica.
+                   Listas no modo 'full', np.memmap no modo 'memmap' e ndarrays (G, N, D) e (G, N) nos demais.
+        """
+        if self.mode == 'off':
+            return [], []
+        if self.mode == 'full':
+            return self._population, self._fitness
+        if self.mode == 'memmap':
+            self._population.close()
+            self._fitness.close()
+            return open_history(self.path)
+
+        slots = len(self._population)
+        if self.count <= slots:
+            return self._population[:self.count], self._fitness[:self.count]
+
+        # O buffer deu a volta: reordena a partir da geração mais antiga
+        start = self.count % slots
+        order = np.r_[start:slots, 0:start]
+        return self._population[order], self._fitness[order]
@@ -0,0 +1,76 @@
+import os
+import json
+import hashlib
+import numpy as np
+from function import ObjectiveFunction
+from checkpoint import atomic_write
+
+# ==============================================================================
+# CACHE DAS GRADES DE FUNDO (PAISAGEM DA FUNÇÃO OBJETIVO)
+# ==============================================================================
+# As grades usadas nos fundos das animações e nos gráficos 3D são gravadas em disco
+# ('<chave>.npy' com Z e '<chave>.json' com min/max), indexadas pelo nome da função,
+# limites e passo, e reaproveitadas entre processos e sessões.
+
+LANDSCAPE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'landscapes')
+LANDSCAPE_VERSION = 1 # Incrementar quando alguma função objetivo mudar, invalidando o cache
+
+def landscape_axes(bounds, step):
+    """
+    Eixos X e Y da grade, do limite inferior ao superior (inclusive) com o passo dado.
+    Returns:
+        tuple: Arrays x_range e y_range.
+    """
+    return tuple(np.arange(bounds[0][axis], bounds[1][axis] + step / 2, step) for axis in range(2))
+
+def _cache_key(target_func, bounds, step):
+    description = repr((LANDSCAPE_VERSION, target_func,
+                        [float(v) for v in bounds[0][:2]], [float(v) for v in bounds[1][:2]], float(step)))
+    return f"{target_func}_{hashlib.sha1(description.encode()).hexdigest()[:16]}"
+
+def landscape_grid(objective, bounds, step, cache_dir=LANDSCAPE_CACHE_DIR):
+    """
+    Grade 2-D de uma função objetivo para os fundos dos gráficos, lida do cache em disco quando existir.
+
+    A avaliação é feita em uma instância própria da função objetivo, sem alterar os
+    contadores de avaliações/operações da instância usada pelo otimizador.
+
+    Args:
+        objective (str | ObjectiveFunction | callable): Nome da função no registro, ou objeto com 'target_func'
+            (ObjectiveFunction, CachedObjective). Outros callables f(X, Y) são avaliados sem cache.
+        bounds (tuple): Tupla com os limites ( (mins), (maxs) ); apenas as duas primeiras coordenadas são usadas.
+        step (float): Distância entre os pontos da grade.
+        cache_dir (str): Diretório do cache. None desativa o cache.
+    Returns:
+        tuple: X, Y e Z (meshgrid e valores da função), mínimo e máximo de Z.
+    """
+    X, Y = np.meshgrid(*landscape_axes(bounds, step))
+    target_func = objective if isinstance(objective, str) else getattr(objective, 'target_func', None)
+    if target_func is None:
+        Z = objective(X, Y)
+        return X, Y, Z, float(np.min(Z)), float(np.max(Z))
+
+    if cache_dir is not None:
+        key = _cache_key(target_func, bounds, step)
+        grid_path = os.path.join(cache_dir, f"{key}.npy")
+        meta_path = os.path.join(cache_dir, f"{key}.json")
+        try:
+            with open(meta_path) as file:
+                meta = json.load(file)
+            Z = np.load(grid_path)
+            if Z.shape == X.shape:
+                return X, Y, Z, meta['min'], meta['max']
+        except (OSError, ValueError, KeyError):
+            pass # Ausente ou corrompido: recalcula abaixo
+
+    Z = ObjectiveFunction(target_func, count_ops=False)(X, Y)
+    z_min, z_max = float(np.min(Z)), float(np.max(Z))
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        meta = {'target_func': target_func, 'bounds': [[float(v) for v in bounds[0][:2]], [float(v) for v in bounds[1][:2]]],
+                'step': float(step), 'shape': list(Z.shape), 'min': z_min, 'max': z_max}
+        atomic_write(grid_path, lambda file: np.save(file, Z))
+        atomic_write(meta_path, lambda file: file.write(json.dumps(meta, indent=2).encode()))
+
+    return X, Y, Z, z_min, z_max
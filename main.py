@@ -21,7 +21,7 @@ default_ga_params = {
     'bounds': BOUNDS,
 }
 
-def run_func(target_func_name, pso_params=None, ga_params=None):
+def run_func(target_func_name, pso_params=None, ga_params=None, rng=None):
     """
     Executa o fluxo completo (PSO + GA) para uma função alvo específica,
     gerando as animações correspondentes.
@@ -29,6 +29,7 @@ def run_func(target_func_name, pso_params=None, ga_params=None):
         target_func_name (str): Nome da função alvo ('schwefel_rosenbrock' ou 'rastrigin').
         pso_params (dict, optional): Parâmetros específicos para o PSO. Usa default se None.
         ga_params (dict, optional): Parâmetros específicos para o GA. Usa default se None.
+        rng (np.random.Generator | int, optional): Gerador ou semente. PSO e GA recebem fluxos filhos independentes.
     Returns:
         None
     """
@@ -39,12 +40,16 @@ def run_func(target_func_name, pso_params=None, ga_params=None):
     # Instancia a função objetivo
     obj_func = ObjectiveFunction(target_func=target_func_name)
 
+    # Fluxos aleatórios independentes para PSO e GA (reprodutíveis a partir de uma única semente)
+    pso_rng, ga_rng = np.random.default_rng(rng).spawn(2)
+
     # ------------------- PSO -------------------
     # Usa params passados ou o default
     current_pso_params = default_pso_params.copy() if pso_params is None else pso_params.copy()
     
     # [CORREÇÃO] Injeta a função objetivo no dicionário antes de enviar
     current_pso_params['obj_func'] = obj_func
+    current_pso_params.setdefault('rng', pso_rng)
     
     print(f"\n... Gerando animação PSO para {target_func_name} ...")
     obj_func.reset() # Reset obrigatório antes da rodada final
@@ -56,6 +61,7 @@ def run_func(target_func_name, pso_params=None, ga_params=None):
     
     # [CORREÇÃO] Injeta a função objetivo no dicionário antes de enviar
     current_ga_params['obj_func'] = obj_func
+    current_ga_params.setdefault('rng', ga_rng)
     
     print(f"\n... Gerando animação GA para {target_func_name} ...")
     obj_func.reset() # Reset obrigatório antes da rodada final
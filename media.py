@@ -0,0 +1,115 @@
+import os
+import re
+import shutil
+import hashlib
+import streamlit as st
+from checkpoint import atomic_write
+
+# ==============================================================================
+# CAMADA DE MÍDIA DO APP (IMAGENS, GIFS E VÍDEOS DO CHATBOT)
+# ==============================================================================
+# Cada arquivo é lido/publicado uma única vez e reaproveitado entre reruns e sessões
+# (st.cache_resource), com a chave (caminho, mtime, tamanho): se o arquivo for regerado,
+# a chave muda e ele é publicado de novo.
+# - Imagens e GIFs são copiados para 'static/media/' e exibidos por URL (static serving do
+#   Streamlit, ver .streamlit/config.toml), sem base64 na página: o navegador baixa e guarda
+#   em cache cada arquivo uma vez.
+# - Vídeos vão para st.video com os bytes já em memória; o Streamlit os serve por URL
+#   (o static serving só envia o Content-Type correto para imagens).
+# Sem static serving habilitado, as imagens também passam por st.image (servidas por URL).
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_MEDIA_DIR = os.path.join(APP_DIR, 'static', 'media') # Servido em 'app/static/media/'
+STATIC_MEDIA_URL = 'app/static/media'
+STATIC_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif') # Extensões que o static serving entrega com o tipo correto
+VIDEO_EXTENSIONS = ('.mp4',)
+
+def asset_key(path: str):
+    """
+    Returns:
+        tuple | None: (caminho absoluto, mtime em ns, tamanho) do arquivo, ou None se ele não existir.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _asset_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    """ Conteúdo do arquivo, lido uma vez por versão (cache_resource não copia os bytes a cada acesso). """
+    with open(path, 'rb') as file:
+        return file.read()
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _published_name(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Copia o arquivo para STATIC_MEDIA_DIR com um nome único por versão e apaga as versões anteriores.
+    Returns:
+        str: Nome do arquivo publicado.
+    """
+    stem, ext = os.path.splitext(os.path.basename(path))
+    digest = hashlib.sha1(repr((path, mtime_ns, size)).encode()).hexdigest()[:12]
+    name = f"{stem}_{digest}{ext.lower()}"
+    target = os.path.join(STATIC_MEDIA_DIR, name)
+    if not os.path.exists(target):
+        os.makedirs(STATIC_MEDIA_DIR, exist_ok=True)
+        with open(path, 'rb') as source:
+            atomic_write(target, lambda file: shutil.copyfileobj(source, file))
+        previous = re.compile(rf"{re.escape(stem)}_[0-9a-f]{{12}}{re.escape(ext.lower())}")
+        for old in os.listdir(STATIC_MEDIA_DIR): # Versões anteriores do mesmo arquivo
+            if old != name and previous.fullmatch(old):
+                os.remove(os.path.join(STATIC_MEDIA_DIR, old))
+    return name
+
+def static_url(path: str):
+    """
+    URL relativa do arquivo publicado no static serving, ou None se o arquivo não existir,
+    não for uma imagem ou o static serving estiver desabilitado.
+    """
+    key = asset_key(path)
+    if key is None or os.path.splitext(path)[1].lower() not in STATIC_EXTENSIONS:
+        return None
+    if not st.get_option('server.enableStaticServing'):
+        return None
+    return f"{STATIC_MEDIA_URL}/{_published_name(*key)}"
+
+def render_media(path: str):
+    """ Exibe uma imagem, GIF ou vídeo a partir do cache de mídia. """
+    key = asset_key(path)
+    if key is None:
+        st.warning(f"Arquivo {path} não encontrado no servidor.")
+        return
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext in VIDEO_EXTENSIONS:
+        st.video(_asset_bytes(*key), format='video/mp4')
+        return
+
+    url = static_url(path)
+    if ext == '.gif':
+        if url is not None:
+            st.markdown(f'<img src="{url}" width="800" alt="gif animado">', unsafe_allow_html=True)
+        else:
+            st.image(_asset_bytes(*key), width=800) # O st.image mantém a animação do GIF
+    elif url is not None:
+        st.markdown(f'<img src="{url}" width="600" alt="{os.path.basename(path)}">', unsafe_allow_html=True)
+        st.caption(f"Imagem: {path}")
+    else:
+        st.image(_asset_bytes(*key), caption=f"Imagem: {path}", width=600)
+
+def render_media_list(paths: list, key: str, expanded: bool=True):
+    """
+    Exibe as mídias de uma resposta do chatbot.
+    Args:
+        paths (list): Caminhos das imagens/vídeos.
+        key (str): Chave única da resposta no session_state.
+        expanded (bool): Se False, as mídias só são carregadas quando o usuário pedir (respostas antigas),
+            para que o custo de cada rerun não cresça com o tamanho do histórico.
+    """
+    if not paths:
+        return
+    if not expanded and not st.toggle(f"Mostrar mídias ({len(paths)})", key=key):
+        return
+    for path in paths:
+        render_media(path)
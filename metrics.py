@@ -0,0 +1,114 @@
+import numpy as np
+
+class RunMetrics:
+    """
+    Métricas de uma execução do GA/PSO calculadas durante a própria execução (online),
+    sem guardar o histórico de população ou de fitness.
+
+    A cada geração (inclusive a população inicial, geração 0) o algoritmo chama update(),
+    que mantém:
+    - o melhor valor encontrado até agora ('best') e a geração/NFE em que ele apareceu
+    - o mínimo, a média e o desvio padrão do fitness da geração atual
+    - o número exato de avaliações acumuladas ('evaluations')
+    - a primeira geração/NFE em que cada alvo absoluto ('targets') foi atingido
+    - os pontos de melhoria do melhor valor, de onde discovery() resolve, ao final, os limiares
+      relativos ao resultado final (mesmo critério de analysis.find_discovery)
+
+    Pode ser passado para ga() e pso() pelo parâmetro 'metrics'.
+    """
+    def __init__(self, targets=()):
+        """
+        Args:
+            targets (iterable): Valores de fitness absolutos cuja primeira ocorrência deve ser registrada
+                (ex: ótimo conhecido + tolerância, ver for_objective).
+        """
+        self.targets = sorted(float(target) for target in targets)
+        self.target_hits = {target: None for target in self.targets} # Alvo -> (geração, NFE)
+        self.generation = -1 # Índice da última geração recebida
+        self.evaluations = 0
+        self.best = np.inf
+        self.best_generation = -1
+        self.generation_min = np.nan
+        self.generation_mean = np.nan
+        self.generation_std = np.nan
+        self._improvements = [] # (geração, NFE, melhor valor) a cada melhoria estrita
+        self._pending = len(self.targets) # Alvos ainda não atingidos (os menores ficam por último)
+
+    @classmethod
+    def for_objective(cls, obj_func, dim: int=2, tolerances=(1e-2, 1e-4)):
+        """
+        Métricas com alvos no ótimo conhecido da função objetivo (ver objectives.py).
+        Args:
+            obj_func (ObjectiveFunction): Função objetivo, com optimum() declarado no registro.
+            dim (int): Dimensão do espaço de busca.
+            tolerances (tuple): Distâncias ao valor ótimo consideradas sucesso.
+        """
+        optimum_value = obj_func.optimum(dim)[1]
+        return cls(targets=[optimum_value + tolerance for tolerance in tolerances])
+
+    def update(self, fitness: np.ndarray, evaluations: int=None):
+        """
+        Registra o fitness de uma nova geração.
+        Args:
+            fitness (np.ndarray): Fitness (N,) da geração.
+            evaluations (int): Avaliações da função objetivo feitas nesta geração. Padrão: N.
+        """
+        self.generation += 1
+        self.evaluations += len(fitness) if evaluations is None else evaluations
+        self.generation_min = float(np.min(fitness))
+        self.generation_mean = float(np.mean(fitness))
+        self.generation_std = float(np.std(fitness))
+
+        if self.generation_min < self.best:
+            self.best = self.generation_min
+            self.best_generation = self.generation
+            self._improvements.append((self.generation, self.evaluations, self.best))
+            # Alvos ordenados: os atingidos são sempre os maiores ainda pendentes
+            while self._pending and self.targets[self._pending - 1] >= self.best:
+                self._pending -= 1
+                self.target_hits[self.targets[self._pending]] = (self.generation, self.evaluations)
+
+    def discovery(self, threshold_percent: float=0.1, final_best_z: float=None) -> tuple:
+        """
+        Primeira geração que se aproximou do resultado final, como em analysis.find_discovery.
+        Args:
+            threshold_percent (float): A porcentagem de proximidade para considerar "descoberto".
+            final_best_z (float): Valor de referência. Padrão: o melhor valor da execução.
+        Returns:
+            tuple: Geração da descoberta e NFE exato até ela, ou (-1, -1) se não for encontrada.
+        """
+        final_best_z = self.best if final_best_z is None else final_best_z
+        threshold_val = abs(final_best_z * (threshold_percent / 100.0)) + 1e-9
+        target_fitness = final_best_z + threshold_val
+        for generation, evaluations, best in self._improvements:
+            if best <= target_fitness:
+                return generation, evaluations
+        return -1, -1
+
+    def state_dict(self) -> dict:
+        """ Cópia do estado das métricas, para checkpoints. """
+        state = dict(self.__dict__)
+        state['target_hits'] = dict(self.target_hits)
+        state['_improvements'] = list(self._improvements)
+        return state
+
+    def load_state_dict(self, state: dict):
+        """ Restaura um estado gravado por state_dict. """
+        if sorted(state['targets']) != self.targets:
+            raise ValueError(f"Métricas gravadas com outros alvos: {state['targets']}.")
+        self.__dict__.update(state)
+        self.target_hits = dict(state['target_hits'])
+        self._improvements = list(state['_improvements'])
+
+    def summary(self) -> dict:
+        """ Estado atual das métricas em um dicionário. """
+        return {
+            'generations': self.generation + 1,
+            'evaluations': self.evaluations,
+            'best': self.best,
+            'best_generation': self.best_generation,
+            'generation_min': self.generation_min,
+            'generation_mean': self.generation_mean,
+            'generation_std': self.generation_std,
+            'target_hits': dict(self.target_hits),
+        }
@@ -0,0 +1,229 @@
+import numpy as np
+from costs import OBJECTIVE_COSTS
+
+# ==============================================================================
+# REGISTRO DE FUNÇÕES OBJETIVO
+# ==============================================================================
+# Todas as implementações seguem o mesmo protocolo de avaliação em lote:
+#     kernel(coords, workspace) -> array (N,)
+# onde 'coords' é um array (D, N) (uma linha contígua por coordenada) e
+# 'workspace' é um dicionário da instância chamadora, onde o kernel pode guardar
+# buffers pré-alocados entre chamadas.
+
+class Objective:
+    """
+    Entrada do registro: implementação vetorizada de uma função objetivo e seus metadados
+    (limites declarados, ótimo conhecido e modelo de custo).
+    """
+    def __init__(self, name: str, kernel, bounds: tuple, optimum_position, description: str=''):
+        """
+        Args:
+            name (str): Nome usado em ObjectiveFunction(name).
+            kernel (callable): Implementação kernel(coords (D, N), workspace) -> (N,).
+            bounds (tuple): Limites (inferior, superior) de cada coordenada.
+            optimum_position (callable): Função dim -> posição (D,) do ótimo global conhecido.
+            description (str): Descrição curta.
+        """
+        self.name = name
+        self.kernel = kernel
+        self.cost = OBJECTIVE_COSTS[name]
+        self.lower, self.upper = bounds
+        self.optimum_position = optimum_position
+        self.description = description
+        self._optimum_values = {}
+
+    def bounds(self, dim: int) -> tuple:
+        """ Limites declarados como arrays (D,), no formato esperado por ga()/pso(). """
+        return np.full(dim, float(self.lower)), np.full(dim, float(self.upper))
+
+    def optimum(self, dim: int) -> tuple:
+        """
+        Returns:
+            tuple: Posição (D,) e valor do ótimo global conhecido em D dimensões.
+        """
+        position = np.asarray(self.optimum_position(dim), dtype=float)
+        if dim not in self._optimum_values: # Calculado uma vez por dimensão, fora da contagem de avaliações
+            coords = np.ascontiguousarray(position.reshape(dim, 1))
+            self._optimum_values[dim] = float(self.kernel(coords, {})[0])
+        return position, self._optimum_values[dim]
+
+    def is_success(self, fitness, dim: int, tolerance: float=1e-4):
+        """ Indica (de forma vetorizada) se o fitness chegou a 'tolerance' do ótimo conhecido. """
+        return np.asarray(fitness) - self.optimum(dim)[1] <= tolerance
+
+OBJECTIVES = {}
+
+def register(objective: Objective) -> Objective:
+    """ Adiciona uma função objetivo ao registro. """
+    OBJECTIVES[objective.name] = objective
+    return objective
+
+def get_objective(name: str) -> Objective:
+    """ Busca uma função objetivo no registro, rejeitando nomes desconhecidos. """
+    try:
+        return OBJECTIVES[name]
+    except KeyError:
+        raise ValueError(f"Função objetivo desconhecida: '{name}'. Disponíveis: {sorted(OBJECTIVES)}.") from None
+
+def _buffers(workspace: dict, key: str, shapes: list) -> list:
+    """ Buffers de trabalho do kernel 'key', reaproveitados enquanto os shapes não mudam. """
+    shapes = [tuple(shape) for shape in shapes]
+    cached = workspace.get(key)
+    if cached is None or cached[0] != shapes:
+        cached = (shapes, [np.empty(shape) for shape in shapes])
+        workspace[key] = cached
+    return cached[1]
+
+# ==============================================================================
+# ========================== FUNÇÃO RASTRIGIN ==================================
+# ==============================================================================
+def rastrigin(coords, workspace):
+    # A Rastrigin padrão opera em [-5.12, 5.12].
+    # Como o GA/PSO vai enviar valores em [-500, 500], precisamos comprimir
+    # a entrada para manter a geometria correta da função.
+    dim = coords.shape[0]
+    
+    # Fator de escala: 5.12 / 500 = 0.01024
+    scale_factor = 5.12 / 500.0
+    
+    P_scaled = coords * scale_factor
+    
+    A = 10
+    # Uma parcela por coordenada
+    components = P_scaled**2 - A * np.cos(2 * np.pi * P_scaled)
+    
+    return A * dim + np.sum(components, axis=0)
+
+# ==============================================================================
+# ========================= (Schwefel-Rosenbrock) ==============================
+# ==============================================================================
+def schwefel_rosenbrock(coords, workspace):
+    """
+    Avaliação fundida da Schwefel-Rosenbrock: subexpressões comuns são calculadas uma
+    única vez e os temporários são escritos em buffers pré-alocados (out=).
+    Esta função foi desenhada para operar nativamente em [-500, 500]
+    devido ao componente Schwefel (Z_func).
+    Returns:
+        Array numpy (N,) com o valor da função (único array novo alocado).
+    """
+    dim, num_elements = coords.shape
+    buf, scaled, pair_buf, Z_func, R_func, sum_sq, tmp1, tmp2 = _buffers(
+        workspace, 'schwefel_rosenbrock', [(dim, num_elements)] * 2 + [(dim - 1, num_elements)] + [(num_elements,)] * 5)
+    
+    # Componente Z (Schwefel)
+    np.abs(coords, out=buf)
+    np.sqrt(buf, out=buf)
+    np.sin(buf, out=buf)
+    np.multiply(coords, buf, out=buf)
+    np.sum(buf, axis=0, out=Z_func)
+    np.negative(Z_func, out=Z_func)
+
+    # Reescalonamento interno das variáveis para Rosenbrock
+    np.divide(coords, 250.0, out=scaled)
+    
+    # Componente R (Rosenbrock), somado sobre os pares consecutivos de coordenadas
+    head = scaled[:-1]
+    tail = scaled[1:]
+    np.square(head, out=pair_buf)
+    np.subtract(tail, pair_buf, out=pair_buf)
+    np.square(pair_buf, out=pair_buf)
+    np.multiply(100, pair_buf, out=pair_buf)
+    rosen_rest = buf[:-1]
+    np.subtract(1, head, out=rosen_rest)
+    np.square(rosen_rest, out=rosen_rest)
+    np.add(pair_buf, rosen_rest, out=pair_buf)
+    np.sum(pair_buf, axis=0, out=R_func)
+    
+    # Cálculos para W4 (Ackley/Schaffer mix)
+    x = scaled
+    np.multiply(25, scaled, out=x) # Reaproveita o buffer das variáveis escalonadas
+
+    a = 500
+    b = 0.1
+    c = 0.5 * np.pi
+    
+    # Soma dos quadrados, compartilhada por Ackley e Schaffer
+    np.square(x, out=buf)
+    np.sum(buf, axis=0, out=sum_sq)
+
+    # Componente F10 (Ackley)
+    np.divide(sum_sq, dim, out=tmp1)
+    np.sqrt(tmp1, out=tmp1)
+    np.multiply(-b, tmp1, out=tmp1)
+    np.exp(tmp1, out=tmp1)
+    np.multiply(-a, tmp1, out=tmp1)
+    np.multiply(c, x, out=buf)
+    np.cos(buf, out=buf)
+    np.sum(buf, axis=0, out=tmp2)
+    np.divide(tmp2, dim, out=tmp2)
+    np.exp(tmp2, out=tmp2)
+    F10 = tmp1
+    np.subtract(tmp1, tmp2, out=F10)
+    np.add(F10, np.exp(1), out=F10)
+
+    # Componente zsh (Schaffer)
+    epsilon = 1e-9
+    zsh_numerator = tmp2
+    np.sqrt(sum_sq, out=zsh_numerator)
+    np.sin(zsh_numerator, out=zsh_numerator)
+    np.square(zsh_numerator, out=zsh_numerator)
+    np.subtract(zsh_numerator, 0.5, out=zsh_numerator)
+    zsh_denominator = sum_sq
+    np.multiply(0.1, sum_sq, out=zsh_denominator)
+    np.add(1, zsh_denominator, out=zsh_denominator)
+    np.square(zsh_denominator, out=zsh_denominator)
+    np.add(zsh_denominator, epsilon, out=zsh_denominator)
+    zsh = zsh_numerator
+    np.divide(zsh_numerator, zsh_denominator, out=zsh)
+    np.subtract(0.5, zsh, out=zsh)
+    
+    # Fobj
+    Fobj = F10
+    np.multiply(F10, zsh, out=Fobj)
+
+    # w1 = Rosenbrock + Schwefel
+    result = R_func + Z_func
+    
+    # w4
+    w4_val = tmp2
+    np.square(R_func, out=R_func)
+    np.square(Z_func, out=Z_func)
+    np.add(R_func, Z_func, out=w4_val)
+    np.sqrt(w4_val, out=w4_val)
+    np.add(w4_val, Fobj, out=w4_val)
+    
+    result += w4_val # Retorna a soma completa
+    return result
+
+# ==============================================================================
+# ========================= BENCHMARKS CLÁSSICOS ===============================
+# ==============================================================================
+def ackley(coords, workspace):
+    dim = coords.shape[0]
+    mean_sq = np.sum(coords**2, axis=0) / dim
+    mean_cos = np.sum(np.cos(2 * np.pi * coords), axis=0) / dim
+    return -20 * np.exp(-0.2 * np.sqrt(mean_sq)) - np.exp(mean_cos) + 20 + np.e
+
+def griewank(coords, workspace):
+    dim = coords.shape[0]
+    divisors = np.sqrt(np.arange(1, dim + 1))[:, None]
+    return 1 + np.sum(coords**2, axis=0) / 4000 - np.prod(np.cos(coords / divisors), axis=0)
+
+def schwefel(coords, workspace):
+    dim = coords.shape[0]
+    return 418.9828872724338 * dim - np.sum(coords * np.sin(np.sqrt(np.abs(coords))), axis=0)
+
+def rosenbrock(coords, workspace):
+    head = coords[:-1]
+    tail = coords[1:]
+    return np.sum(100 * (tail - head**2)**2 + (1 - head)**2, axis=0)
+
+register(Objective('rastrigin', rastrigin, (-500, 500), np.zeros,
+                   'Rastrigin clássica, adaptada para receber entrada [-500, 500]'))
+register(Objective('schwefel_rosenbrock', schwefel_rosenbrock, (-500, 500), np.zeros,
+                   'Soma completa (Original Scilab); ótimo conhecido na origem'))
+register(Objective('ackley', ackley, (-32.768, 32.768), np.zeros, 'Ackley clássica'))
+register(Objective('griewank', griewank, (-600, 600), np.zeros, 'Griewank clássica'))
+register(Objective('schwefel', schwefel, (-500, 500), lambda dim: np.full(dim, 420.9687462275036),
+                   'Schwefel 2.26 clássica'))
+register(Objective('rosenbrock', rosenbrock, (-5, 10), np.ones, 'Rosenbrock clássica (vale de Rosenbrock)'))
@@ -1,18 +1,17 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from function import ObjectiveFunction
+from landscape import landscape_grid
 
 objective_function = ObjectiveFunction('schwefel_rosenbrock')
 
-# Define o intervalo para o plot
-# x_range = np.arange(-3.12, 3.12, 0.1)
-# y_range = np.arange(-3.12, 3.12, 0.1)
-x_range = np.arange(-500, 500, 5)
-y_range = np.arange(-500, 500, 5)
-X, Y = np.meshgrid(x_range, y_range)
+# Define o intervalo e o passo da grade do plot
+# BOUNDS = (np.array([-3.12, -3.12]), np.array([3.12, 3.12])); STEP = 0.1
+BOUNDS = (np.array([-500, -500]), np.array([500, 500]))
+STEP = 5
 
-# Calcula os valores de Z usando a função objetivo
-Z = objective_function(X, Y)
+# Calcula (ou lê do cache em disco) os valores de Z usando a função objetivo
+X, Y, Z, _, _ = landscape_grid(objective_function, BOUNDS, STEP)
 
 # Cria a figura 3D interativa
 fig, ax = plt.subplots(subplot_kw={'projection': '3d'}, figsize=(12, 8))
@@ -1,115 +1,218 @@
+import os
 import numpy as np
 import matplotlib.pyplot as plt
-from collections import defaultdict
 import re
+from run_store import open_run_store
+
+RUN_SEPARATOR = re.compile(r'-{10,}') # Separador entre execuções no log
+RECORD_START = re.compile(r'^\s*(\d+),\s*\[') # Início de uma linha no formato "1, [ ... ]"
+
+def iter_log_records(filepath: str):
+    """
+    Lê um arquivo de log linha a linha, com memória limitada a um registro por vez.
+
+    Args:
+        filepath (str): O caminho para o arquivo .txt.
+
+    Yields:
+        tuple: (execução, iteração, array com o fitness da população), na ordem do arquivo.
+    """
+    run = 0
+    run_has_records = False
+    iteration = None # Iteração do registro em andamento (que pode ocupar várias linhas)
+    parts = []
+    with open(filepath, 'r') as f:
+        for line in f:
+            if iteration is None:
+                if RUN_SEPARATOR.search(line): # Blocos vazios entre separadores não contam como execução
+                    if run_has_records:
+                        run += 1
+                        run_has_records = False
+                    continue
+                match = RECORD_START.match(line)
+                if not match:
+                    continue
+                iteration = int(match.group(1))
+                line = line[match.end():]
+
+            closing = line.find(']')
+            if closing < 0:
+                parts.append(line)
+                continue
+            parts.append(line[:closing])
+
+            try:
+                fitness_values = np.array(' '.join(parts).split(), dtype=float) # Conversão feita em C, sem float() por valor
+                if fitness_values.size:
+                    run_has_records = True
+                    yield run, iteration, fitness_values
+            except ValueError:
+                print(f"Aviso: Não foi possível processar a linha da iteração {iteration}.")
+            iteration = None
+            parts = []
+
+def summarize_records(runs, iterations, counts, means, m2s, bests) -> dict:
+    """
+    Monta as tabelas (R, G) de resumo por execução e iteração a partir de um registro por linha.
+    Cada população entra apenas pelo seu resumo (tamanho, média, soma dos quadrados dos desvios
+    e melhor valor), de modo que a memória cresce com execuções x iterações, e não com o número de indivíduos.
+
+    Args:
+        runs, iterations (np.ndarray): Execução e iteração de cada registro (L,).
+        counts, means, m2s, bests (np.ndarray): Resumo da população de cada registro (L,).
+
+    Returns:
+        dict: 'iterations' (G,) e tabelas (R, G) 'count', 'mean', 'm2' e 'best'. Iterações ausentes
+              em uma execução ficam com count 0 e NaN nas demais tabelas.
+    """
+    run_index = np.unique(np.asarray(runs), return_inverse=True)[1]
+    iterations = np.asarray(iterations, dtype=int)
+    first_iteration = iterations.min()
+    num_runs = run_index.max() + 1
+    num_iterations = iterations.max() - first_iteration + 1
+    columns = iterations - first_iteration
+
+    table = {'iterations': np.arange(first_iteration, first_iteration + num_iterations)}
+    for name, values in (('count', counts), ('mean', means), ('m2', m2s), ('best', bests)):
+        fill = 0 if name == 'count' else np.nan
+        table[name] = np.full((num_runs, num_iterations), fill, dtype=float)
+        table[name][run_index, columns] = values
+    return table
 
 def parse_full_log_file(filepath: str) -> dict:
     """
-    Lê um arquivo de log e agrupa a LISTA COMPLETA de fitness de cada 
-    execução por número de iteração.
+    Lê um arquivo de log, linha a linha, e resume o fitness de cada execução por número de iteração.
 
     Args:
         filepath (str): O caminho para o arquivo .txt.
 
     Returns:
-        dict: Dicionário onde chaves são iterações e valores são listas de listas.
-              Ex: {1: [[run1_fitnesses], [run2_fitnesses]], 2: [...]}
+        dict: Tabelas de resumo por execução e iteração (ver summarize_records).
     """
-    # Usamos defaultdict(list) para agrupar as execuções por iteração
-    data_by_iteration = defaultdict(list)
     print(f"Lendo e processando o arquivo de log completo: {filepath}")
-    
+    records = []
     try:
-        with open(filepath, 'r') as f:
-            full_log_content = f.read()
-
-        # Separa o log em blocos de execução, usando o separador "---"
-        # Filtra blocos vazios que podem surgir de linhas em branco
-        execution_blocks = [block for block in re.split(r'-{10,}', full_log_content) if block.strip()]
-
-        for block in execution_blocks:
-            # Padrão para encontrar linhas no formato: "1, [ ... ]"
-            # O re.DOTALL permite que o '.' capture também as quebras de linha
-            matches = re.finditer(r'^\s*(\d+),\s*\[(.*?)\]', block, re.DOTALL | re.MULTILINE)
-            for match in matches:
-                iteration = int(match.group(1))
-                list_str = match.group(2).replace('\n', ' ')
-                
-                try:
-                    fitness_values = [float(num) for num in list_str.split() if num]
-                    if fitness_values:
-                        # Adiciona a lista completa de fitness para esta iteração/execução
-                        data_by_iteration[iteration].append(fitness_values)
-                except ValueError:
-                    print(f"Aviso: Não foi possível processar a linha da iteração {iteration}.")
-
+        for run, iteration, fitness_values in iter_log_records(filepath):
+            mean = fitness_values.mean()
+            records.append((run, iteration, fitness_values.size, mean,
+                            np.sum((fitness_values - mean)**2), fitness_values.min()))
     except FileNotFoundError:
         print(f"ERRO: Arquivo não encontrado em '{filepath}'.")
         return None
-        
+
     print("Processamento do arquivo concluído.")
-    return data_by_iteration
+    if not records:
+        return None
+    return summarize_records(*np.array(records).T)
 
+def load_run_store(path: str, chunk_rows: int=65536) -> dict:
+    """
+    Lê um RunStore (ver run_store.py) coluna a coluna, em blocos de linhas com memória limitada.
+    A população inicial de cada execução aparece como iteração 0.
+
+    Args:
+        path (str): Diretório do armazenamento.
+        chunk_rows (int): Linhas de fitness lidas por vez.
+
+    Returns:
+        dict: Tabelas de resumo por execução e iteração (ver summarize_records).
+    """
+    print(f"Lendo o armazenamento de execuções: {path}")
+    columns = open_run_store(path)
+    fitness = columns['fitness']
+    num_rows = len(fitness)
+    if num_rows == 0:
+        return None
+
+    means = np.empty(num_rows)
+    m2s = np.empty(num_rows)
+    bests = np.empty(num_rows)
+    for start in range(0, num_rows, chunk_rows):
+        chunk = np.asarray(fitness[start:start + chunk_rows])
+        chunk_means = chunk.mean(axis=1)
+        means[start:start + len(chunk)] = chunk_means
+        m2s[start:start + len(chunk)] = np.sum((chunk - chunk_means[:, None])**2, axis=1)
+        bests[start:start + len(chunk)] = chunk.min(axis=1)
+
+    print("Processamento do armazenamento concluído.")
+    return summarize_records(columns['run'], columns['generation'], np.full(num_rows, fitness.shape[1]),
+                             means, m2s, bests)
+
+def load_convergence_data(path: str) -> dict:
+    """ Lê um diretório de RunStore ou, caso contrário, um arquivo de log de texto. """
+    if os.path.isdir(path):
+        return load_run_store(path)
+    return parse_full_log_file(path)
+
+def convergence_statistics(data: dict, quantiles: tuple=(0.25, 0.5, 0.75)) -> dict:
+    """
+    Calcula as curvas de convergência a partir das tabelas de resumo, só com operações sobre arrays.
+
+    Args:
+        data (dict): Tabelas de resumo por execução e iteração (ver summarize_records).
+        quantiles (tuple): Quantis do melhor valor encontrado entre as execuções.
+
+    Returns:
+        dict: Curvas por iteração: 'iterations', 'avg_best_so_far', 'best_so_far_quantiles' (Q, G),
+              'avg_population_fitness' e 'std_population_fitness'.
+    """
+    best = data['best']
+    num_iterations = best.shape[1]
+
+    # Preenche os NaNs com o último valor conhecido de cada execução (forward fill por índices)
+    known = ~np.isnan(best)
+    last_known = np.where(known, np.arange(num_iterations), 0)
+    np.maximum.accumulate(last_known, axis=1, out=last_known)
+    filled = np.take_along_axis(best, last_known, axis=1)
+    filled[np.cumsum(known, axis=1) == 0] = np.nan # Antes do primeiro registro da execução não há valor
+
+    best_so_far_matrix = np.fmin.accumulate(filled, axis=1) # Ignora os NaNs iniciais
+    has_runs = ~np.all(np.isnan(best_so_far_matrix), axis=0)
+    avg_best_so_far = np.full(num_iterations, np.nan)
+    avg_best_so_far[has_runs] = np.nanmean(best_so_far_matrix[:, has_runs], axis=0)
+    best_so_far_quantiles = np.full((len(quantiles), num_iterations), np.nan)
+    best_so_far_quantiles[:, has_runs] = np.nanquantile(best_so_far_matrix[:, has_runs], quantiles, axis=0)
+
+    # Média e desvio padrão de toda a população, combinando os resumos das execuções (Chan et al.)
+    counts = data['count']
+    total_counts = counts.sum(axis=0)
+    valid = total_counts > 0
+    safe_counts = np.where(valid, total_counts, 1)
+    means = np.nan_to_num(data['mean'])
+    population_mean = np.sum(counts * means, axis=0) / safe_counts
+    m2 = np.sum(np.nan_to_num(data['m2']), axis=0) + np.sum(counts * (means - population_mean)**2, axis=0)
+    population_std = np.sqrt(m2 / safe_counts)
+
+    return {
+        'iterations': data['iterations'][valid],
+        'avg_best_so_far': avg_best_so_far[valid],
+        'best_so_far_quantiles': best_so_far_quantiles[:, valid],
+        'avg_population_fitness': population_mean[valid],
+        'std_population_fitness': population_std[valid],
+    }
 
 def generate_convergence_plot(data: dict, output_filename: str, algorithm_name: str):
     """
     Calcula e plota as métricas de convergência, incluindo a média e o desvio
-    padrão de toda a população.
+    padrão de toda a população e a mediana/quartis do melhor valor entre as execuções.
     """
     if not data:
         print(f"Nenhum dado para plotar para o {algorithm_name}.")
         return
 
     print(f"Para {algorithm_name}: Calculando métricas de convergência...")
-    
-    iterations = sorted(data.keys())
-    
-    # --- NOVOS CÁLCULOS ---
-    # Média de toda a população a cada iteração
-    avg_population_fitness = []
-    # Desvio padrão de toda a população a cada iteração
-    std_population_fitness = []
-    # Melhor valor médio encontrado (mesma lógica de antes)
-    avg_best_so_far = []
-    
-    # Para calcular o "melhor até agora", primeiro estruturamos os dados por execução
-    num_runs = max(len(v) for v in data.values()) if data else 0
-    max_iter = max(data.keys())
-    
-    # Matriz para os melhores de cada run/iteração
-    best_per_run_matrix = np.full((num_runs, max_iter), np.nan)
-    for i_iter, runs_for_iter in data.items():
-        for i_run, run_fitness_list in enumerate(runs_for_iter):
-            best_per_run_matrix[i_run, i_iter-1] = min(run_fitness_list)
-
-    # Preenche os NaNs e calcula a curva de convergência média
-    for i_run in range(num_runs):
-        last_val = np.nan
-        for i_iter in range(max_iter):
-            if not np.isnan(best_per_run_matrix[i_run, i_iter]):
-                last_val = best_per_run_matrix[i_run, i_iter]
-            else:
-                best_per_run_matrix[i_run, i_iter] = last_val
-
-    best_so_far_matrix = np.minimum.accumulate(best_per_run_matrix, axis=1)
-    avg_best_so_far = np.nanmean(best_so_far_matrix, axis=0)
-
-    # Agora, calcula as estatísticas da população inteira
-    for i in iterations:
-        # Junta todas as listas de fitness de uma iteração em uma única lista gigante
-        all_fitness_at_iter = [item for sublist in data[i] for item in sublist]
-        avg_population_fitness.append(np.mean(all_fitness_at_iter))
-        std_population_fitness.append(np.std(all_fitness_at_iter))
+    statistics = convergence_statistics(data)
+    iterations = statistics['iterations']
+    avg_population_fitness = statistics['avg_population_fitness']
+    std_population_fitness = statistics['std_population_fitness']
+    avg_best_so_far = statistics['avg_best_so_far']
+    q25_best, median_best, q75_best = statistics['best_so_far_quantiles']
 
     print("Gerando o gráfico...")
     # --- PLOTAGEM ATUALIZADA ---
     plt.style.use('seaborn-v0_8-whitegrid')
     fig, ax = plt.subplots(figsize=(12, 8))
 
-    # Converte para arrays numpy
-    avg_population_fitness = np.array(avg_population_fitness)
-    std_population_fitness = np.array(std_population_fitness)
-
     # Plota a MÉDIA DE FITNESS DE TODA A POPULAÇÃO (linha tracejada)
     ax.plot(iterations, avg_population_fitness, color='deepskyblue', linestyle='--', label=f'Média da População ({algorithm_name})')
     
@@ -125,6 +228,10 @@ def generate_convergence_plot(data: dict, output_filename: str, algorithm_name:
     
     # Plota a CURVA DE CONVERGÊNCIA REAL (melhor valor encontrado)
     ax.plot(iterations, avg_best_so_far, color='red', linewidth=2.5, label='Média do Melhor')
+
+    # Plota a MEDIANA do melhor valor e a faixa entre os quartis das execuções
+    ax.plot(iterations, median_best, color='darkred', linestyle=':', linewidth=2, label='Mediana do Melhor')
+    ax.fill_between(iterations, q25_best, q75_best, color='red', alpha=0.15, label='Quartis do Melhor (25%-75%)')
     
     # --- FORMATAÇÃO E TÍTULOS ---
     ax.set_title(f'Gráfico de Convergência - {algorithm_name}', fontsize=16, weight='bold')
@@ -139,9 +246,9 @@ def generate_convergence_plot(data: dict, output_filename: str, algorithm_name:
 
 if __name__ == '__main__':
     # =================================================================
-    log_filepath = 'pso.txt'
+    log_filepath = 'pso.txt' # Log de texto ou diretório de um RunStore (ex: 'runs/pso')
     # =================================================================
 
-    data = parse_full_log_file(log_filepath)
+    data = load_convergence_data(log_filepath)
     if data:
         generate_convergence_plot(data, 'imgs/grafico_convergencia_pso.png', "PSO")
\ No newline at end of file
@@ -0,0 +1,58 @@
+from time import perf_counter
+from typing import NamedTuple
+import numpy as np
+
+class PhaseTimer:
+    """
+    Cronômetro por fase (seleção, crossover, avaliação...) de uma execução do GA/PSO.
+    Cada lap(fase) soma à fase o tempo decorrido desde o lap anterior, com uma única
+    chamada a perf_counter por fase.
+    """
+    def __init__(self):
+        self.totals = {} # Fase -> segundos acumulados
+        self._last = perf_counter()
+
+    def restart(self):
+        """ Reinicia a contagem do lap atual (o tempo desde o último lap é descartado). """
+        self._last = perf_counter()
+
+    def lap(self, phase: str):
+        """ Atribui à fase 'phase' o tempo decorrido desde o último lap. """
+        now = perf_counter()
+        self.totals[phase] = self.totals.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+class _NullTimer:
+    """ Cronômetro desativado: mesmos métodos do PhaseTimer, sem nenhum custo além da chamada. """
+    totals = {}
+
+    def restart(self):
+        pass
+
+    def lap(self, phase: str):
+        pass
+
+NULL_TIMER = _NullTimer()
+
+def make_timer(enabled: bool):
+    """ PhaseTimer se 'enabled', senão o cronômetro nulo compartilhado. """
+    return PhaseTimer() if enabled else NULL_TIMER
+
+class IterationState(NamedTuple):
+    """
+    Visão do estado de uma execução, entregue ao callback 'on_iteration' ao final de cada iteração/geração.
+    Os arrays são os da própria execução (sem cópia) e não devem ser modificados.
+    """
+    iteration: int # Iteração/geração recém-concluída (a partir de 1)
+    population: np.ndarray # Posições (N, D) da população/enxame
+    fitness: np.ndarray # Fitness (N,) da população/enxame
+    best_position: np.ndarray # Melhor posição encontrada até agora (D,)
+    best_fitness: float # Melhor fitness encontrado até agora
+    stagnation_counter: int # Iterações consecutivas sem melhoria significativa
+    evaluations: int # Avaliações da função objetivo feitas até agora (NFE)
+
+def format_timings(timings: dict) -> str:
+    """ Tempos por fase em uma linha, do mais lento para o mais rápido, com a fração do total. """
+    total = sum(timings.values()) or 1.0
+    return ', '.join(f"{phase} {seconds * 1e3:.1f} ms ({seconds / total:.0%})"
+                     for phase, seconds in sorted(timings.items(), key=lambda item: -item[1]))
@@ -1,112 +1,455 @@
 from function import ObjectiveFunction
+from history import HistoryRecorder
+from run_store import RunStore
+from metrics import RunMetrics
+from profiling import IterationState, make_timer, NULL_TIMER
+from checkpoint import (Checkpointer, DEFAULT_CHECKPOINT_INTERVAL, optimizer_state,
+                        restore_optimizer_state, run_state, restore_run_state)
+from costs import pso_update_cost, operation_totals
 import numpy as np
 
-def pso(obj_func: ObjectiveFunction, num_particles: int, max_iterations: int, bounds: tuple, 
-        cognitive_coeff: float=1.5, social_coeff: float=1.5, min_w: float=0.2, max_w: float=0.9,
-        tolerance: float=1e-6, patience: int=10):
-    """Algoritmo de Otimização por Enxame de Partículas (PSO).
-    Args:
-        obj_func (ObjectiveFunction): Instância da função objetivo a ser minimizada.
-        num_particles (int): Número de partículas no enxame.
-        max_iterations (int): Número máximo de iterações.
-        bounds (tuple): Limites inferior e superior para as partículas.
-        cognitive_coeff (float): Coeficiente cognitivo (peso da experiência pessoal).
-        social_coeff (float): Coeficiente social (peso da experiência do grupo).
-        min_w (float): Peso mínimo da inércia. (maior que 0)
-        max_w (float): Peso máximo da inércia (max 1)
-        tolerance (float): Tolerância para considerar que não houve melhoria significativa.
-        patience (int): Número de iterações sem melhoria antes de parar.
-    Returns:
-        tuple: Melhor posição encontrada, seu valor de fitness, histórico de posições e histórico de fitnesse contador de operações.
+class PSO:
     """
+    Enxame de Partículas com interface ask/tell: o estado da execução fica no objeto e a
+    avaliação da função objetivo fica a cargo de quem o usa (ex: um avaliador que junta,
+    em um único lote, os enxames de várias execuções; ver ask_tell.py).
 
-    # --- INICIALIZAÇÃO ---
-    particles = np.random.uniform(bounds[0], bounds[1], (num_particles, 2))
-    velocities = np.zeros_like(particles)
-    fitness = obj_func(particles[:, 0], particles[:, 1])
-    counter = {'multiplications': 0, 'divisions': 0} # Contador de operações
-    personal_best_positions = particles.copy()
-    personal_best_fitness = fitness.copy()
-    global_best_index = np.argmin(personal_best_fitness)
-    global_best_position = personal_best_positions[global_best_index].copy()
-    pos_history = [particles.copy()] # Histórico de posições
-    fitness_history = [fitness.copy()] # Histórico de fitness
-    stagnation_counter = 0
-    last_global_best_fitness = np.inf
+    Uso:
+        optimizer = PSO(30, bounds, max_iterations=200, rng=seed)
+        while not optimizer.stopped:
+            particles = optimizer.ask() # Bloco (N, D) a ser avaliado
+            optimizer.tell(obj_func.evaluate(particles)) # Fitness (N,), na mesma ordem
 
-    # --- ITERAÇÕES ---
-    stagnation_reached = False
-    for iteration in range(max_iterations): # Iterações do PSO
-        r1 = np.random.rand(num_particles, 2) # Fator aleatório para componente cognitivo
-        r2 = np.random.rand(num_particles, 2) # Fator aleatório para componente social
+    O primeiro ask() devolve o enxame inicial e os seguintes, as novas posições. A ordem dos
+    sorteios é a mesma de pso(), que é apenas este laço: mesma semente, mesmo resultado.
+    """
+    # Estado da execução gravado nos checkpoints e parâmetros que precisam coincidir para retomá-la
+    _STATE_FIELDS = ('particles', 'velocities', 'fitness', 'iteration', 'evaluations', 'personal_best_positions',
+                     'personal_best_fitness', 'global_best_position', 'global_best_fitness', 'stagnation_counter',
+                     'last_global_best_fitness')
+    _CONFIG_FIELDS = ('num_particles', 'bounds', 'max_iterations', 'cognitive_coeff', 'social_coeff', 'min_w',
+                      'max_w', 'tolerance', 'patience', 'count_ops')
+
+    def __init__(self, num_particles: int, bounds: tuple, max_iterations: int, cognitive_coeff: float=1.5,
+                 social_coeff: float=1.5, min_w: float=0.2, max_w: float=0.9, tolerance: float=1e-6,
+                 patience: int=10, rng=None, count_ops: bool=True, timer=NULL_TIMER):
+        """
+        Args:
+            num_particles (int): Número de partículas no enxame.
+            bounds (tuple): Limites inferior e superior para as partículas. O tamanho dos limites define a dimensão D.
+            max_iterations (int): Número máximo de iterações (também define o decaimento do peso da inércia).
+            cognitive_coeff (float): Coeficiente cognitivo (peso da experiência pessoal).
+            social_coeff (float): Coeficiente social (peso da experiência do grupo).
+            min_w (float): Peso mínimo da inércia. (maior que 0)
+            max_w (float): Peso máximo da inércia (max 1)
+            tolerance (float): Tolerância para considerar que não houve melhoria significativa.
+            patience (int): Número de iterações sem melhoria antes de parar.
+            rng (np.random.Generator | int | None): Gerador de números aleatórios ou semente.
+            count_ops (bool): Se False, não contabiliza multiplicações/divisões dos operadores.
+            timer (PhaseTimer): Cronômetro das fases (ver profiling.py). Padrão: desativado.
+        """
+        self.num_particles = num_particles
+        self.bounds = bounds
+        self.max_iterations = max_iterations
+        self.cognitive_coeff = cognitive_coeff
+        self.social_coeff = social_coeff
+        self.min_w = min_w
+        self.max_w = max_w
+        self.tolerance = tolerance
+        self.patience = patience
+        self.count_ops = count_ops
+        self.timer = timer
+        self.rng = np.random.default_rng(rng) # Aceita um Generator pronto ou uma semente
+        self.dim = len(bounds[0]) # Dimensão do espaço de busca, definida pelos limites
+
+        self.particles = None # Últimas posições entregues por ask()
+        self.velocities = None
+        self.fitness = None # Fitness das últimas posições avaliadas
+        self.iteration = -1 # Última iteração avaliada (0 = enxame inicial)
+        self.evaluations = 0
+        self.personal_best_positions = None
+        self.personal_best_fitness = None
+        self.global_best_position = None
+        self.global_best_fitness = np.inf # Fitness do gbest guardado como estado, sem reavaliar
+
+        # Variáveis para rastrear a estagnação
+        self.stagnation_counter = 0
+        self.last_global_best_fitness = np.inf
+        self._pending = False # Se há um ask() aguardando o tell() correspondente
+
+    @property
+    def stagnated(self) -> bool:
+        return self.iteration > 0 and self.stagnation_counter >= self.patience # Só verificado após uma iteração
+
+    @property
+    def stopped(self) -> bool:
+        """ Se a execução terminou, por estagnação ou por atingir o número máximo de iterações. """
+        return self.stagnated or self.iteration >= self.max_iterations
+
+    def ask(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Bloco (N, D) com as posições a serem avaliadas. Não deve ser modificado.
+        """
+        if self._pending:
+            raise RuntimeError("ask() chamado novamente antes do tell() das posições anteriores.")
+        self._pending = True
+        rng = self.rng
+        bounds = self.bounds
+        timer = self.timer
+
+        if self.fitness is None:
+            self.particles = rng.uniform(bounds[0], bounds[1], (self.num_particles, self.dim))
+            self.velocities = np.zeros_like(self.particles)
+            timer.lap('initialization')
+            return self.particles
+
+        particles = self.particles
+        r1 = rng.random((self.num_particles, self.dim)) # Fator aleatório para componente cognitivo
+        r2 = rng.random((self.num_particles, self.dim)) # Fator aleatório para componente social
 
         # --- COMPONENTE COGNITIVO ---
-        cognitive_component = cognitive_coeff * r1 * (personal_best_positions - particles)
-        counter['multiplications'] += 2 * particles.size # Contabiliza as multiplicações
+        cognitive_component = self.cognitive_coeff * r1 * (self.personal_best_positions - particles)
 
         # --- COMPONENTE SOCIAL ---
-        social_component = social_coeff * r2 * (global_best_position - particles)
-        counter['multiplications'] += 2 * particles.size # Contabiliza as multiplicações
+        social_component = self.social_coeff * r2 * (self.global_best_position - particles)
 
         # --- PESO DA INÉRCIA DECRESCENTE ---
-        inertia_weight = max_w - ((max_w - min_w) * (iteration / max_iterations)) # Peso da inércia decrescente
-        counter['divisions'] += num_particles # Contabiliza as divisões
+        max_w, min_w = self.max_w, self.min_w
+        inertia_weight = max_w - ((max_w - min_w) * (self.iteration / self.max_iterations)) # Peso da inércia decrescente
         inertia_weight = max(min(inertia_weight, max_w), min_w) # Garante que o peso da inércia esteja dentro dos limites
         
         # --- ATUALIZAÇÃO DAS VELOCIDADES ---
-        velocities = (inertia_weight * velocities) + cognitive_component + social_component # Atualiza as velocidades
-        counter['multiplications'] += particles.size # Contabiliza as multiplicações
+        self.velocities = (inertia_weight * self.velocities) + cognitive_component + social_component # Atualiza as velocidades
+        timer.lap('velocity')
         
         # --- ATUALIZAÇÃO DAS POSIÇÕES ---
-        particles += velocities # Atualiza as posições das partículas adicionando as velocidades
-        particles = np.clip(particles, bounds[0], bounds[1]) # Garante que as partículas permaneçam dentro dos limites
-        
-        # --- AVALIAÇÃO DA FUNÇÃO OBJETIVO ---
-        fitness = obj_func(particles[:, 0], particles[:, 1]) # Avalia a função objetivo para as novas posições
-        # print(f"z: {fitness}") # Debug: Exibe o valor de fitness calculado
-        
+        particles += self.velocities # Atualiza as posições das partículas adicionando as velocidades
+        timer.lap('position')
+        self.particles = np.clip(particles, bounds[0], bounds[1]) # Garante que as partículas permaneçam dentro dos limites
+        timer.lap('clipping')
+        return self.particles
+
+    def tell(self, fitness: np.ndarray):
+        """
+        Recebe o fitness das posições entregues pelo último ask() e avança o estado.
+        Args:
+            fitness (np.ndarray): Fitness (N,) de cada partícula, na ordem de ask().
+        """
+        if not self._pending:
+            raise RuntimeError("tell() chamado sem um ask() pendente.")
+        fitness = np.asarray(fitness, dtype=float)
+        if fitness.shape != (self.num_particles,):
+            raise ValueError(f"Fitness com shape {fitness.shape}; esperado ({self.num_particles},).")
+        self._pending = False
+        self.fitness = fitness
+        self.iteration += 1
+        self.evaluations += self.num_particles
+        particles = self.particles
+
+        if self.iteration == 0: # Enxame inicial: pbest e gbest partem das posições iniciais
+            self.personal_best_positions = particles.copy()
+            self.personal_best_fitness = fitness.copy()
+            global_best_index = np.argmin(self.personal_best_fitness)
+            self.global_best_position = self.personal_best_positions[global_best_index].copy()
+            self.global_best_fitness = self.personal_best_fitness[global_best_index]
+            return
+
         # --- ATUALIZAÇÃO DE MELHORES ---
         # Encontra o melhor da iteração atual
         current_iter_best_index = np.argmin(fitness)
         current_iter_best_fitness = fitness[current_iter_best_index]
         
         # Compara o melhor da iteração atual com o melhor global
-        if current_iter_best_fitness < obj_func(global_best_position[0], global_best_position[1]):
-            global_best_position = particles[current_iter_best_index].copy()
+        if current_iter_best_fitness < self.global_best_fitness:
+            self.global_best_position = particles[current_iter_best_index].copy()
+            self.global_best_fitness = current_iter_best_fitness
         
         # As partículas atualizam seu pbest com base na nova posição
-        update_mask = fitness < personal_best_fitness # Apenas as partículas que melhoraram
-        personal_best_positions[update_mask] = particles[update_mask] # Atualiza as melhores posições pessoais
-        personal_best_fitness[update_mask] = fitness[update_mask] # Atualiza os melhores fitness pessoais 
+        update_mask = fitness < self.personal_best_fitness # Apenas as partículas que melhoraram
+        self.personal_best_positions[update_mask] = particles[update_mask] # Atualiza as melhores posições pessoais
+        self.personal_best_fitness[update_mask] = fitness[update_mask] # Atualiza os melhores fitness pessoais 
         
-        current_global_best_fitness = obj_func(global_best_position[0], global_best_position[1])
-        improvement = last_global_best_fitness - current_global_best_fitness
-        pos_history.append(particles.copy())
-        fitness_history.append(fitness.copy())
-
-        # print(f"{iteration + 1}, {fitness}")
-
         # --- VERIFICAÇÃO DE CONVERGÊNCIA ---
-        if improvement > tolerance: # Se houve melhoria significativa
-            stagnation_counter = 0
+        improvement = self.last_global_best_fitness - self.global_best_fitness
+        if improvement > self.tolerance: # Se houve melhoria significativa
+            self.stagnation_counter = 0
         else:
-            stagnation_counter += 1
-            
-        if stagnation_counter >= patience:
-            stagnation_reached = True
-            last_global_best_fitness = current_global_best_fitness
-            break
+            self.stagnation_counter += 1
+        self.last_global_best_fitness = self.global_best_fitness # Para ser usado na próxima iteração
+        self.timer.lap('best')
+
+    def state_dict(self) -> dict:
+        """ Cópia do estado da execução (inclusive do gerador aleatório), para checkpoints. """
+        return optimizer_state(self, self._STATE_FIELDS, self._CONFIG_FIELDS)
+
+    def load_state_dict(self, state: dict):
+        """ Restaura um estado gravado por state_dict. ValueError se os parâmetros forem diferentes. """
+        restore_optimizer_state(self, state, self._CONFIG_FIELDS)
+
+    def result(self) -> tuple:
+        """ Melhor posição encontrada e seu fitness, como retornados por pso(). """
+        return self.global_best_position, self.last_global_best_fitness
+
+    def operation_counts(self) -> dict:
+        """ Contador de operações da atualização (modelo de custo em costs.py) e NFE exato até aqui. """
+        counter = {'multiplications': 0, 'divisions': 0}
+        if self.count_ops:
+            counter = operation_totals({'update': pso_update_cost(self.dim)},
+                                       {'update': max(self.iteration, 0) * self.num_particles})
+        counter['evaluations'] = self.evaluations # NFE exato desta execução
+        return counter
+
+def pso(obj_func: ObjectiveFunction, num_particles: int, max_iterations: int, bounds: tuple, 
+        cognitive_coeff: float=1.5, social_coeff: float=1.5, min_w: float=0.2, max_w: float=0.9,
+        tolerance: float=1e-6, patience: int=10, history: str='full', history_every: int=1, history_capacity: int=None,
+        history_path: str=None, rng=None, count_ops: bool=True, run_store: RunStore=None,
+        metrics: RunMetrics=None, profile: bool=False, on_iteration=None, checkpoint_path: str=None,
+        checkpoint_interval: float=DEFAULT_CHECKPOINT_INTERVAL):
+    """Algoritmo de Otimização por Enxame de Partículas (PSO), como laço ask/avaliação/tell sobre a classe PSO.
+    Args:
+        obj_func (ObjectiveFunction): Instância da função objetivo a ser minimizada.
+        num_particles (int): Número de partículas no enxame.
+        max_iterations (int): Número máximo de iterações.
+        bounds (tuple): Limites inferior e superior para as partículas. O tamanho dos limites define a dimensão D.
+        cognitive_coeff (float): Coeficiente cognitivo (peso da experiência pessoal).
+        social_coeff (float): Coeficiente social (peso da experiência do grupo).
+        min_w (float): Peso mínimo da inércia. (maior que 0)
+        max_w (float): Peso máximo da inércia (max 1)
+        tolerance (float): Tolerância para considerar que não houve melhoria significativa.
+        patience (int): Número de iterações sem melhoria antes de parar.
+        history (str): Modo do histórico: 'full', 'off', 'best', 'every' ou 'buffer' (ver HistoryRecorder).
+        history_every (int): Intervalo entre iterações armazenadas no modo 'every'.
+        history_capacity (int): Iterações comportadas pelo histórico pré-alocado. Padrão: max_iterations + 1.
+        history_path (str): Prefixo dos arquivos .npy do histórico no modo 'memmap'.
+        rng (np.random.Generator | int | None): Gerador de números aleatórios ou semente (ex: np.random.Generator(np.random.PCG64DXSM(seed))).
+        count_ops (bool): Se False, não contabiliza multiplicações/divisões dos operadores.
+        run_store (RunStore): Armazenamento colunar onde o fitness de cada geração é acrescentado (ver run_store.py).
+        metrics (RunMetrics): Métricas atualizadas a cada geração, sem guardar histórico (ver metrics.py).
+        profile (bool): Se True, mede o tempo de cada fase e o devolve em counter['timings'] (ver profiling.py).
+        on_iteration (callable): Chamado ao final de cada iteração com um IterationState. Se retornar True, a execução é interrompida.
+        checkpoint_path (str): Arquivo de checkpoint. Se existir, a execução é retomada dele (bit a bit); é gravado a cada 'checkpoint_interval' segundos e apagado ao final.
+        checkpoint_interval (float): Intervalo mínimo entre gravações do checkpoint, em segundos.
+    Returns:
+        tuple: Melhor posição encontrada, seu valor de fitness, histórico de posições e histórico de fitness e contador de operações (inclui 'evaluations', o NFE exato da execução, e 'timings', os segundos por fase, se profile=True).
+    """
+
+    # --- INICIALIZAÇÃO ---
+    timer = make_timer(profile) # Cronômetro por fase (nulo se profile=False)
+    optimizer = PSO(num_particles, bounds, max_iterations, cognitive_coeff, social_coeff, min_w, max_w,
+                    tolerance, patience, rng=rng, count_ops=count_ops, timer=timer)
+    checkpointer = None if checkpoint_path is None else Checkpointer(checkpoint_path, checkpoint_interval)
+    checkpoint = None if checkpointer is None else checkpointer.load()
+    recorder = HistoryRecorder(history, num_particles, optimizer.dim, capacity=history_capacity or max_iterations + 1,
+                               every=history_every, path=history_path, append=checkpoint is not None)
+    if checkpoint is not None: # Retoma a execução interrompida
+        run_id = restore_run_state(checkpoint, optimizer, recorder, run_store, metrics)
+        print(f"Execução retomada do checkpoint na iteração {optimizer.iteration}.")
+    else:
+        particles = optimizer.ask() # Enxame inicial
+        fitness = obj_func.evaluate(particles)
+        timer.lap('evaluation')
+        optimizer.tell(fitness) # pbest e gbest iniciais
+        recorder.record(particles, fitness) # Histórico de posições e de fitness
+        run_id = None
+        if run_store is not None:
+            run_id = run_store.new_run()
+            run_store.record(run_id, 0, fitness)
+        if metrics is not None:
+            metrics.update(fitness, num_particles)
+        timer.lap('history')
+
+    # --- ITERAÇÕES ---
+    stopped_by_callback = False
+    while not optimizer.stopped: # Iterações do PSO
+        particles = optimizer.ask() # Velocidades, posições e clipping
+        
+        # --- AVALIAÇÃO DA FUNÇÃO OBJETIVO ---
+        fitness = obj_func.evaluate(particles) # Avalia a função objetivo para as novas posições
+        timer.lap('evaluation')
+        # print(f"z: {fitness}") # Debug: Exibe o valor de fitness calculado
+        optimizer.tell(fitness) # pbest, gbest e estagnação
+        iteration = optimizer.iteration
+        
+        recorder.record(particles, fitness)
+        if run_store is not None:
+            run_store.record(run_id, iteration, fitness)
+        if metrics is not None:
+            metrics.update(fitness, num_particles)
+        timer.lap('history')
 
-        last_global_best_fitness = current_global_best_fitness # Para ser usado na próxima iteração
+        # print(f"{iteration}, {fitness}")
+
+        # --- CALLBACK ---
+        if on_iteration is not None:
+            state = IterationState(iteration, particles, fitness, optimizer.global_best_position,
+                                   optimizer.global_best_fitness, optimizer.stagnation_counter, optimizer.evaluations)
+            stopped_by_callback = bool(on_iteration(state))
+            timer.lap('callback')
+            if stopped_by_callback:
+                break
+
+        # --- CHECKPOINT ---
+        if checkpointer is not None and checkpointer.due():
+            checkpointer.save(run_state(optimizer, recorder, run_store, run_id, metrics))
+            timer.lap('checkpoint')
     
         # --- DEBUG ---
-        # print(f"Iteração {iteration + 1}: Melhor posição: ({global_best_position[0]:.4f}, {global_best_position[1]:.4f}), Z ótimo: {current_global_best_fitness:.2f}, Melhoria: {improvement:.6f}")
+        # print(f"Iteração {iteration}: Melhor posição: ({optimizer.global_best_position[0]:.4f}, {optimizer.global_best_position[1]:.4f}), Z ótimo: {optimizer.global_best_fitness:.2f}")
         # --- FIM DEBUG ---
 
-    if stagnation_reached:
-        print(f"Convergência atingida na iteração {iteration + 1} devido à estagnação.")
+    if checkpointer is not None:
+        checkpointer.remove() # Execução concluída
+    if stopped_by_callback:
+        print(f"Execução interrompida pelo callback na iteração {optimizer.iteration}.")
+    elif optimizer.stagnated:
+        print(f"Convergência atingida na iteração {optimizer.iteration} devido à estagnação.")
     else:
         print(f"Número máximo de iterações ({max_iterations}) atingido")
 
 
-    return global_best_position, last_global_best_fitness, pos_history, fitness_history, counter
\ No newline at end of file
+    # --- CONTAGEM DE OPERAÇÕES (modelo de custo em costs.py) ---
+    counter = optimizer.operation_counts()
+    if profile:
+        counter['timings'] = dict(timer.totals) # Segundos por fase
+
+    pos_history, fitness_history = recorder.export()
+    return optimizer.global_best_position, optimizer.last_global_best_fitness, pos_history, fitness_history, counter
+
+def pso_batch(obj_func: ObjectiveFunction, num_runs: int, num_particles: int, max_iterations: int, bounds: tuple,
+              cognitive_coeff: float=1.5, social_coeff: float=1.5, min_w: float=0.2, max_w: float=0.9,
+              tolerance: float=1e-6, patience: int=10, history: str='full', history_every: int=1,
+              history_capacity: int=None, history_path: str=None, rng=None, count_ops: bool=True,
+              run_store: RunStore=None, metrics: list=None) -> list:
+    """PSO em lote: executa 'num_runs' enxames independentes em paralelo, como um único array (R, N, D).
+    Cada enxame mantém seu próprio pbest/gbest, contador de estagnação e critério de parada. Enxames que
+    já pararam ficam congelados e deixam de ser avaliados.
+    Args:
+        obj_func (ObjectiveFunction): Instância da função objetivo a ser minimizada.
+        num_runs (int): Número de execuções (enxames) independentes.
+        num_particles (int): Número de partículas em cada enxame.
+        max_iterations (int): Número máximo de iterações.
+        bounds (tuple): Limites inferior e superior para as partículas. O tamanho dos limites define a dimensão D.
+        cognitive_coeff (float): Coeficiente cognitivo (peso da experiência pessoal).
+        social_coeff (float): Coeficiente social (peso da experiência do grupo).
+        min_w (float): Peso mínimo da inércia. (maior que 0)
+        max_w (float): Peso máximo da inércia (max 1)
+        tolerance (float): Tolerância para considerar que não houve melhoria significativa.
+        patience (int): Número de iterações sem melhoria antes de parar.
+        history (str): Modo do histórico: 'full', 'off', 'best', 'every' ou 'buffer' (ver HistoryRecorder).
+        history_every (int): Intervalo entre iterações armazenadas no modo 'every'.
+        history_capacity (int): Iterações comportadas pelo histórico pré-alocado. Padrão: max_iterations + 1.
+        history_path (str): Prefixo dos arquivos .npy do histórico no modo 'memmap'. Cada execução recebe o sufixo '_<r>'.
+        rng (np.random.Generator | int | None): Gerador de números aleatórios ou semente, compartilhado por todos os enxames.
+        count_ops (bool): Se False, não contabiliza multiplicações/divisões dos operadores.
+        run_store (RunStore): Armazenamento colunar onde o fitness de cada geração é acrescentado (ver run_store.py).
+        metrics (list): Um RunMetrics por execução, atualizados a cada iteração (ver metrics.py).
+    Returns:
+        list: Uma tupla por execução, no mesmo formato retornado por pso().
+    """
+
+    # --- INICIALIZAÇÃO ---
+    rng = np.random.default_rng(rng) # Aceita um Generator pronto ou uma semente
+    dim = len(bounds[0]) # Dimensão do espaço de busca, definida pelos limites
+    particles = rng.uniform(bounds[0], bounds[1], (num_runs, num_particles, dim))
+    velocities = np.zeros_like(particles)
+    fitness = obj_func.evaluate(particles) # (R, N)
+    iterations_run = np.zeros(num_runs, dtype=int) # Iterações de cada enxame, de onde derivam os contadores
+    personal_best_positions = particles.copy()
+    personal_best_fitness = fitness.copy()
+    global_best_index = np.argmin(personal_best_fitness, axis=1)
+    run_indices = np.arange(num_runs)
+    global_best_position = personal_best_positions[run_indices, global_best_index].copy() # (R, D)
+    global_best_fitness = personal_best_fitness[run_indices, global_best_index].copy() # (R,)
+    recorders = [HistoryRecorder(history, num_particles, dim,
+                                 capacity=history_capacity or max_iterations + 1, every=history_every,
+                                 path=None if history_path is None else f"{history_path}_{r}")
+                 for r in range(num_runs)] # Um histórico por execução
+    for r in range(num_runs):
+        recorders[r].record(particles[r], fitness[r])
+    run_ids = None
+    if run_store is not None:
+        run_ids = [run_store.new_run() for _ in range(num_runs)] # Uma execução do armazenamento por enxame
+        for r in range(num_runs):
+            run_store.record(run_ids[r], 0, fitness[r])
+    if metrics is not None:
+        for r in range(num_runs):
+            metrics[r].update(fitness[r], num_particles)
+    stagnation_counter = np.zeros(num_runs, dtype=int)
+    last_global_best_fitness = np.full(num_runs, np.inf)
+    active = np.ones(num_runs, dtype=bool) # Máscara dos enxames que ainda estão rodando
+
+    # --- ITERAÇÕES ---
+    for iteration in range(max_iterations):
+        if not active.any(): # Todos os enxames pararam
+            break
+        idx = np.flatnonzero(active)
+        num_active = idx.size
+
+        x = particles[idx]
+        r1 = rng.random((num_active, num_particles, dim)) # Fator aleatório para componente cognitivo
+        r2 = rng.random((num_active, num_particles, dim)) # Fator aleatório para componente social
+
+        # --- COMPONENTES COGNITIVO E SOCIAL ---
+        cognitive_component = cognitive_coeff * r1 * (personal_best_positions[idx] - x)
+        social_component = social_coeff * r2 * (global_best_position[idx, None, :] - x)
+
+        # --- PESO DA INÉRCIA DECRESCENTE ---
+        inertia_weight = max_w - ((max_w - min_w) * (iteration / max_iterations)) # Igual para todos os enxames
+        inertia_weight = max(min(inertia_weight, max_w), min_w)
+
+        # --- ATUALIZAÇÃO DAS VELOCIDADES E POSIÇÕES ---
+        v = (inertia_weight * velocities[idx]) + cognitive_component + social_component
+        x = np.clip(x + v, bounds[0], bounds[1])
+        velocities[idx] = v
+        particles[idx] = x
+        iterations_run[idx] += 1
+
+        # --- AVALIAÇÃO DA FUNÇÃO OBJETIVO ---
+        fit = obj_func.evaluate(x) # (A, N)
+
+        # --- ATUALIZAÇÃO DE MELHORES ---
+        iter_best_index = np.argmin(fit, axis=1)
+        iter_best_fitness = fit[np.arange(num_active), iter_best_index]
+        improved = iter_best_fitness < global_best_fitness[idx]
+        improved_runs = idx[improved]
+        global_best_position[improved_runs] = x[improved, iter_best_index[improved]]
+        global_best_fitness[improved_runs] = iter_best_fitness[improved]
+
+        pbest_pos = personal_best_positions[idx]
+        pbest_fit = personal_best_fitness[idx]
+        update_mask = fit < pbest_fit # Apenas as partículas que melhoraram
+        pbest_pos[update_mask] = x[update_mask]
+        pbest_fit[update_mask] = fit[update_mask]
+        personal_best_positions[idx] = pbest_pos
+        personal_best_fitness[idx] = pbest_fit
+
+        for k, r in enumerate(idx):
+            recorders[r].record(x[k], fit[k])
+            if run_store is not None:
+                run_store.record(run_ids[r], iteration + 1, fit[k])
+            if metrics is not None:
+                metrics[r].update(fit[k], num_particles)
+
+        # --- VERIFICAÇÃO DE CONVERGÊNCIA ---
+        current_global_best_fitness = global_best_fitness[idx]
+        improvement = last_global_best_fitness[idx] - current_global_best_fitness
+        stagnation = np.where(improvement > tolerance, 0, stagnation_counter[idx] + 1)
+        stagnation_counter[idx] = stagnation
+        last_global_best_fitness[idx] = current_global_best_fitness
+        active[idx[stagnation >= patience]] = False # Enxames sem paciência param aqui
+
+    num_stagnated = int(np.sum(stagnation_counter >= patience))
+    print(f"Lote de {num_runs} execuções: {num_stagnated} convergiram por estagnação, "
+          f"{num_runs - num_stagnated} atingiram o máximo de iterações ({max_iterations})")
+
+    counters = []
+    for r in range(num_runs):
+        counter = {'multiplications': 0, 'divisions': 0}
+        if count_ops:
+            counter = operation_totals({'update': pso_update_cost(dim)}, {'update': int(iterations_run[r]) * num_particles})
+        counter['evaluations'] = (int(iterations_run[r]) + 1) * num_particles
+        counters.append(counter)
+
+    return [(global_best_position[r].copy(), last_global_best_fitness[r], *recorders[r].export(), counters[r])
+            for r in range(num_runs)]
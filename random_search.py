@@ -1,25 +1,30 @@
 import numpy as np
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from function import ObjectiveFunction
 from pso import pso
 from ga import ga
+from checkpoint import Checkpointer, DEFAULT_CHECKPOINT_INTERVAL
 
 # ==============================================================================
 # CONFIGURAÇÕES DA BUSCA
 # ==============================================================================
 SEARCH_ITERATIONS = 20
+SEARCH_STRATEGY = 'random' # 'random' (random search) ou 'hyperband' (successive halving, interrompe configurações ruins cedo)
 BOUNDS = (np.array([-500, -500]), np.array([500, 500]))
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'tuning') # Progresso do tuning, para retomar
 
 # Instâncias das funções
 obj_func_rastrigin = ObjectiveFunction('rastrigin')
-obj_func_w1w4 = ObjectiveFunction('w1_w4')
+obj_func_w1w4 = ObjectiveFunction('schwefel_rosenbrock') # W1+W4
 
 def format_params_for_display(params):
     """
     Formata o dicionário de parâmetros para parecer código Python limpo.
-    Remove objetos como 'obj_func' e 'bounds' para facilitar o copy-paste.
+    Remove objetos como 'obj_func' e 'bounds' (e opções de execução como 'history')
+    para facilitar o copy-paste.
     """
-    clean_params = {k: v for k, v in params.items() if k not in ['obj_func', 'bounds']}
+    clean_params = {k: v for k, v in params.items() if k not in ['obj_func', 'bounds', 'history']}
     
     formatted_str = "{\n"
     for key, value in clean_params.items():
@@ -48,81 +53,323 @@ def save_results_to_txt(filename, func_name, pso_params, ga_params, pso_score, g
     
     print(f"Arquivo salvo: {filename}")
 
-def tune_pso(obj_func, bounds, iterations=20):
-    func_name = obj_func.target_func
-    print(f"\n>>> [TUNING] Iniciando Random Search PSO para '{func_name}' ({iterations} iterações)...")
+def sample_pso_config(bounds, rng):
+    """
+    Sorteia uma configuração de hiperparâmetros para o PSO usando o gerador 'rng' da tentativa.
+    """
+    current_max_w = rng.uniform(0.5, 0.95)
     
+    return {
+        'num_particles': rng.integers(20, 80),
+        'max_iterations': 200, 
+        'bounds': bounds,
+        'cognitive_coeff': rng.uniform(0.5, 2.5),
+        'social_coeff': rng.uniform(0.5, 2.5),
+        'max_w': current_max_w,
+        'min_w': rng.uniform(0.1, current_max_w - 0.05),
+        'tolerance': 1e-5,
+        'patience': 25,
+        'history': 'off' # O tuning descarta os históricos
+    }
+
+def sample_ga_config(bounds, rng):
+    """
+    Sorteia uma configuração de hiperparâmetros para o GA usando o gerador 'rng' da tentativa.
+    """
+    pop_size = rng.integers(30, 100)
+    elitism = rng.integers(1, max(2, int(pop_size * 0.2)))
+    
+    return {
+        'num_individuals': pop_size,
+        'max_generations': 200, 
+        'bounds': bounds,
+        'mutation_rate': rng.uniform(0.01, 0.4),
+        'mutation_strength': rng.uniform(1.0, 40.0), 
+        'crossover_rate': rng.uniform(0.6, 0.95),
+        'elitism_size': elitism,
+        'tolerance': 1e-5,
+        'patience': 25,
+        'history': 'off' # O tuning descarta os históricos
+    }
+
+# Algoritmo, amostrador de configurações e parâmetro que define o orçamento de iterações
+ALGORITHMS = {
+    'pso': (pso, sample_pso_config, 'max_iterations'),
+    'ga': (ga, sample_ga_config, 'max_generations'),
+}
+
+def run_trial(algorithm, target_func, bounds, rng, budget=None):
+    """
+    Executa uma tentativa do tuning: sorteia uma configuração e roda o algoritmo.
+    Cada tentativa cria sua própria ObjectiveFunction e usa o seu próprio fluxo
+    aleatório, de modo que o resultado não depende de qual processo a executa.
+    Args:
+        algorithm (str): 'pso' ou 'ga'.
+        target_func (str): Nome da função objetivo.
+        bounds (tuple): Limites do espaço de busca.
+        rng (np.random.Generator | np.random.SeedSequence | int): Fluxo aleatório da tentativa.
+            O mesmo fluxo sempre gera a mesma configuração e a mesma execução.
+        budget (int): Se informado, substitui o número máximo de iterações/gerações da configuração.
+    Returns:
+        tuple: Configuração sorteada (sem 'obj_func'), o melhor fitness obtido e o número de avaliações usadas.
+    """
+    optimizer, sample_config, budget_key = ALGORITHMS[algorithm]
+    rng = np.random.default_rng(rng)
+    config = sample_config(bounds, rng)
+    if budget is not None:
+        config[budget_key] = budget
+    _, cost, _, _, counter = optimizer(obj_func=ObjectiveFunction(target_func), rng=rng, **config)
+    return config, cost, counter['evaluations']
+
+def spawn_seeds(rng, count):
+    """
+    Deriva 'count' fluxos aleatórios independentes (SeedSequence filhas) a partir de uma
+    semente, SeedSequence ou Generator mestre.
+    """
+    if isinstance(rng, np.random.Generator):
+        return rng.bit_generator.seed_seq.spawn(count)
+    if not isinstance(rng, np.random.SeedSequence):
+        rng = np.random.SeedSequence(rng)
+    return rng.spawn(count)
+
+class TrialCheckpoint:
+    """
+    Resultados das tentativas já concluídas de um tuning, gravados em disco a cada 'interval'
+    segundos (ver checkpoint.py). Ao reexecutar o tuning com o mesmo arquivo, as tentativas
+    concluídas são reaproveitadas em vez de executadas de novo. A semente raiz também é
+    guardada, de modo que um tuning sem 'rng' explícito retoma com as mesmas tentativas.
+    """
+    def __init__(self, path, interval=DEFAULT_CHECKPOINT_INTERVAL):
+        self.checkpointer = Checkpointer(path, interval)
+        state = self.checkpointer.load() or {}
+        self.entropy = state.get('entropy')
+        self.trials = state.get('trials', {}) # Chave da tentativa -> (configuração, fitness, avaliações)
+
+    def seed(self, rng):
+        """ Semente raiz da busca. Se 'rng' for None, usa a entropia gravada (ou sorteia e grava uma nova). """
+        if rng is not None:
+            return rng
+        if self.entropy is None:
+            self.entropy = np.random.SeedSequence().entropy
+            self.save()
+        return np.random.SeedSequence(self.entropy)
+
+    def add(self, key, result):
+        self.trials[key] = result
+        if self.checkpointer.due():
+            self.save()
+
+    def save(self):
+        self.checkpointer.save({'entropy': self.entropy, 'trials': self.trials})
+
+    def remove(self):
+        self.checkpointer.remove()
+
+def trial_key(algorithm, target_func, seed, budget=None):
+    """ Identifica uma tentativa pelo seu fluxo aleatório (SeedSequence) e orçamento. """
+    return (algorithm, target_func, seed.entropy, tuple(seed.spawn_key), budget)
+
+def execute_trials(algorithm, target_func, bounds, seeds, budget=None, workers=None, checkpoint=None):
+    """
+    Executa uma tentativa por semente em um pool de processos.
+    Args:
+        algorithm (str): 'pso' ou 'ga'.
+        target_func (str): Nome da função objetivo (cada processo cria sua própria instância).
+        bounds (tuple): Limites do espaço de busca.
+        seeds (list): Fluxos aleatórios (SeedSequence) das tentativas.
+        budget (int): Orçamento de iterações/gerações de cada tentativa (ver run_trial).
+        workers (int): Número de processos. Padrão: os.cpu_count(). Com 1, roda no processo atual.
+        checkpoint (TrialCheckpoint): Se informado, tentativas já concluídas são lidas dele e as novas são gravadas nele.
+    Yields:
+        tuple: (índice da tentativa, configuração, fitness, avaliações), conforme as tentativas terminam.
+    """
+    pending = list(range(len(seeds)))
+    if checkpoint is not None:
+        keys = [trial_key(algorithm, target_func, trial_rng, budget) for trial_rng in seeds]
+        for trial in [trial for trial in pending if keys[trial] in checkpoint.trials]:
+            pending.remove(trial)
+            yield (trial, *checkpoint.trials[keys[trial]])
+
+    workers = workers or os.cpu_count()
+    try:
+        if workers == 1:
+            results = ((trial, run_trial(algorithm, target_func, bounds, seeds[trial], budget)) for trial in pending)
+            for trial, result in results:
+                if checkpoint is not None:
+                    checkpoint.add(keys[trial], result)
+                yield (trial, *result)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_trial, algorithm, target_func, bounds, seeds[trial], budget): trial
+                       for trial in pending}
+            for future in as_completed(futures):
+                trial, result = futures[future], future.result()
+                if checkpoint is not None:
+                    checkpoint.add(keys[trial], result)
+                yield (trial, *result)
+    finally:
+        if checkpoint is not None: # Grava o que foi concluído, inclusive se o tuning for interrompido
+            checkpoint.save()
+
+def run_trials(algorithm, obj_func, bounds, iterations=20, workers=None, rng=None, checkpoint_path=None):
+    """
+    Random search: executa as tentativas do tuning em um pool de processos.
+    Args:
+        algorithm (str): 'pso' ou 'ga'.
+        obj_func (ObjectiveFunction): Função objetivo (apenas o nome é enviado aos processos).
+        bounds (tuple): Limites do espaço de busca.
+        iterations (int): Número de tentativas.
+        workers (int): Número de processos. Padrão: os.cpu_count(). Com 1, roda no processo atual.
+        rng (np.random.Generator | int | None): Gerador ou semente da busca. Cada tentativa recebe um fluxo filho (SeedSequence.spawn).
+        checkpoint_path (str): Arquivo de checkpoint do tuning. Se existir, as tentativas já concluídas são reaproveitadas; é apagado ao final.
+    Returns:
+        tuple: Melhor configuração (com 'obj_func') e seu fitness.
+    """
+    checkpoint = None if checkpoint_path is None else TrialCheckpoint(checkpoint_path)
+    if checkpoint is not None:
+        rng = checkpoint.seed(rng)
     best_config = None
     best_global_fitness = np.inf
-    
-    for i in range(iterations):
-        # 1. Amostragem Aleatória
-        current_max_w = np.random.uniform(0.5, 0.95)
-        
-        config = {
-            'obj_func': obj_func,
-            'num_particles': np.random.randint(20, 80),
-            'max_iterations': 200, 
-            'bounds': bounds,
-            'cognitive_coeff': np.random.uniform(0.5, 2.5),
-            'social_coeff': np.random.uniform(0.5, 2.5),
-            'max_w': current_max_w,
-            'min_w': np.random.uniform(0.1, current_max_w - 0.05),
-            'tolerance': 1e-5,
-            'patience': 25
-        }
-        
-        # 2. Execução Rápida
-        obj_func.reset()
-        _, cost, _, _, _ = pso(**config)
-        
-        # 3. Comparação
-        if cost < best_global_fitness:
+    best_trial = None
+    total_evaluations = 0
+
+    # Coleta o melhor até agora conforme as tentativas terminam
+    for trial, config, cost, evaluations in execute_trials(algorithm, obj_func.target_func, bounds,
+                                                           spawn_seeds(rng, iterations), workers=workers,
+                                                           checkpoint=checkpoint):
+        total_evaluations += evaluations
+        # Empate decidido pelo índice da tentativa, para não depender da ordem de término
+        if cost < best_global_fitness or (cost == best_global_fitness and trial < best_trial):
             best_global_fitness = cost
             best_config = config
-            
+            best_trial = trial
+            print(f"    Tentativa {trial + 1}/{iterations}: novo melhor Z = {cost:.8f}")
+
+    print(f"    Total de avaliações da função: {total_evaluations}")
+    if checkpoint is not None:
+        checkpoint.remove() # Tuning concluído
+    best_config = {'obj_func': obj_func, **best_config}
     return best_config, best_global_fitness
 
-def tune_ga(obj_func, bounds, iterations=20):
+def successive_halving(algorithm, obj_func, bounds, num_configs=27, min_budget=8, max_budget=200, eta=3,
+                       workers=None, rng=None, checkpoint=None):
+    """
+    Successive halving: todas as configurações começam com um orçamento pequeno de
+    iterações/gerações e, a cada degrau (rung), apenas a melhor fração 1/eta é promovida
+    para um orçamento eta vezes maior, até chegar a 'max_budget'.
+    Args:
+        algorithm (str): 'pso' ou 'ga'.
+        obj_func (ObjectiveFunction): Função objetivo (apenas o nome é enviado aos processos).
+        bounds (tuple): Limites do espaço de busca.
+        num_configs (int): Número de configurações sorteadas no primeiro degrau.
+        min_budget (int): Orçamento mínimo (iterações/gerações) do primeiro degrau.
+        max_budget (int): Orçamento do último degrau.
+        eta (int): Fator de redução entre degraus.
+        workers (int): Número de processos (ver execute_trials).
+        rng (np.random.Generator | int | None): Gerador ou semente da busca.
+        checkpoint (TrialCheckpoint): Tentativas já concluídas, compartilhadas entre os brackets do hyperband.
+    Returns:
+        tuple: Melhor configuração (com 'obj_func'), seu fitness e o total de avaliações usadas.
+    """
+    num_rungs = int(np.floor(np.log(max_budget / min_budget) / np.log(eta) + 1e-9)) + 1
+    seeds = spawn_seeds(rng, num_configs)
+    total_evaluations = 0
+
+    for rung in range(num_rungs):
+        budget = int(round(max_budget * eta ** (rung - num_rungs + 1)))
+        results = {}
+        for trial, config, cost, evaluations in execute_trials(algorithm, obj_func.target_func, bounds, seeds,
+                                                               budget=budget, workers=workers, checkpoint=checkpoint):
+            results[trial] = (cost, config)
+            total_evaluations += evaluations
+
+        ranking = sorted(results, key=lambda trial: (results[trial][0], trial)) # Empate pelo índice
+        best_cost, best_config = results[ranking[0]]
+        print(f"    Degrau {rung + 1}/{num_rungs}: {len(seeds)} configurações com orçamento {budget}, "
+              f"melhor Z = {best_cost:.8f}")
+
+        num_promoted = max(1, len(seeds) // eta)
+        if rung == num_rungs - 1 or len(seeds) == 1:
+            break
+        seeds = [seeds[trial] for trial in ranking[:num_promoted]]
+
+    best_config = {'obj_func': obj_func, **best_config}
+    return best_config, best_cost, total_evaluations
+
+def hyperband(algorithm, obj_func, bounds, min_budget=8, max_budget=200, eta=3, workers=None, rng=None,
+              checkpoint_path=None):
+    """
+    Hyperband: executa vários successive halving (brackets), do mais agressivo (muitas
+    configurações, orçamento inicial mínimo) ao mais conservador (poucas configurações com
+    orçamento máximo), e retorna o melhor resultado entre eles.
+    Args: ver successive_halving e run_trials ('checkpoint_path').
+    Returns:
+        tuple: Melhor configuração (com 'obj_func') e seu fitness.
+    """
     func_name = obj_func.target_func
-    print(f"\n>>> [TUNING] Iniciando Random Search GA para '{func_name}' ({iterations} iterações)...")
-    
+    print(f"\n>>> [TUNING] Iniciando Hyperband {algorithm.upper()} para '{func_name}'...")
+    checkpoint = None if checkpoint_path is None else TrialCheckpoint(checkpoint_path)
+    if checkpoint is not None:
+        rng = checkpoint.seed(rng)
+
+    s_max = int(np.floor(np.log(max_budget / min_budget) / np.log(eta) + 1e-9))
+    bracket_seeds = spawn_seeds(rng, s_max + 1)
     best_config = None
     best_global_fitness = np.inf
-    
-    for i in range(iterations):
-        # 1. Amostragem Aleatória
-        pop_size = np.random.randint(30, 100)
-        elitism = np.random.randint(1, max(2, int(pop_size * 0.2)))
-        
-        config = {
-            'obj_func': obj_func,
-            'num_individuals': pop_size,
-            'max_generations': 200, 
-            'bounds': bounds,
-            'mutation_rate': np.random.uniform(0.01, 0.4),
-            'mutation_strength': np.random.uniform(1.0, 40.0), 
-            'crossover_rate': np.random.uniform(0.6, 0.95),
-            'elitism_size': elitism,
-            'tolerance': 1e-5,
-            'patience': 25
-        }
-        
-        # 2. Execução Rápida
-        obj_func.reset()
-        _, cost, _, _, _ = ga(**config)
-        
-        # 3. Comparação
+    total_evaluations = 0
+
+    for s in range(s_max, -1, -1):
+        num_configs = int(np.ceil((s_max + 1) / (s + 1) * eta ** s))
+        config, cost, evaluations = successive_halving(
+            algorithm, obj_func, bounds, num_configs=num_configs,
+            min_budget=max_budget / eta ** s, max_budget=max_budget, eta=eta,
+            workers=workers, rng=bracket_seeds[s], checkpoint=checkpoint)
+        total_evaluations += evaluations
         if cost < best_global_fitness:
             best_global_fitness = cost
             best_config = config
 
+    print(f"    Total de avaliações da função: {total_evaluations}")
+    if checkpoint is not None:
+        checkpoint.remove() # Tuning concluído
     return best_config, best_global_fitness
 
+def tune_pso(obj_func, bounds, iterations=20, workers=None, rng=None, checkpoint_path=None):
+    func_name = obj_func.target_func
+    print(f"\n>>> [TUNING] Iniciando Random Search PSO para '{func_name}' ({iterations} iterações)...")
+    return run_trials('pso', obj_func, bounds, iterations=iterations, workers=workers, rng=rng,
+                      checkpoint_path=checkpoint_path)
+
+def tune_ga(obj_func, bounds, iterations=20, workers=None, rng=None, checkpoint_path=None):
+    func_name = obj_func.target_func
+    print(f"\n>>> [TUNING] Iniciando Random Search GA para '{func_name}' ({iterations} iterações)...")
+    return run_trials('ga', obj_func, bounds, iterations=iterations, workers=workers, rng=rng,
+                      checkpoint_path=checkpoint_path)
+
+def tune_pso_hyperband(obj_func, bounds, max_budget=200, workers=None, rng=None, checkpoint_path=None):
+    return hyperband('pso', obj_func, bounds, max_budget=max_budget, workers=workers, rng=rng,
+                     checkpoint_path=checkpoint_path)
+
+def tune_ga_hyperband(obj_func, bounds, max_budget=200, workers=None, rng=None, checkpoint_path=None):
+    return hyperband('ga', obj_func, bounds, max_budget=max_budget, workers=workers, rng=rng,
+                     checkpoint_path=checkpoint_path)
+
+def run_search(algorithm, obj_func, bounds):
+    """
+    Executa o tuning de um algoritmo com a estratégia definida em SEARCH_STRATEGY.
+    O progresso é gravado em CHECKPOINT_DIR: se o processo for interrompido, a próxima execução continua de onde parou.
+    """
+    checkpoint_path = os.path.join(CHECKPOINT_DIR, f"{SEARCH_STRATEGY}_{algorithm}_{obj_func.target_func}.ckpt")
+    if SEARCH_STRATEGY == 'hyperband':
+        return hyperband(algorithm, obj_func, bounds, checkpoint_path=checkpoint_path)
+    tune = tune_pso if algorithm == 'pso' else tune_ga
+    return tune(obj_func, bounds, iterations=SEARCH_ITERATIONS, checkpoint_path=checkpoint_path)
+
 if __name__ == "__main__":
     # --- EXECUÇÃO PARA RASTRIGIN ---
-    best_pso_rastrigin, score_pso_rast = tune_pso(obj_func_rastrigin, BOUNDS, iterations=SEARCH_ITERATIONS)
-    best_ga_rastrigin, score_ga_rast = tune_ga(obj_func_rastrigin, BOUNDS, iterations=SEARCH_ITERATIONS)
+    best_pso_rastrigin, score_pso_rast = run_search('pso', obj_func_rastrigin, BOUNDS)
+    best_ga_rastrigin, score_ga_rast = run_search('ga', obj_func_rastrigin, BOUNDS)
     
     # Salvar Rastrigin
     save_results_to_txt(
@@ -135,8 +382,8 @@ if __name__ == "__main__":
     )
 
     # --- EXECUÇÃO PARA W1+W4 ---
-    best_pso_w1w4, score_pso_w1 = tune_pso(obj_func_w1w4, BOUNDS, iterations=SEARCH_ITERATIONS)
-    best_ga_w1w4, score_ga_w1 = tune_ga(obj_func_w1w4, BOUNDS, iterations=SEARCH_ITERATIONS)
+    best_pso_w1w4, score_pso_w1 = run_search('pso', obj_func_w1w4, BOUNDS)
+    best_ga_w1w4, score_ga_w1 = run_search('ga', obj_func_w1w4, BOUNDS)
 
     # Salvar W1+W4
     save_results_to_txt(
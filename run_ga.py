@@ -1,6 +1,7 @@
 from ga import ga
 from animator import create_animation
-from analysis import find_discovery
+from metrics import RunMetrics
+from profiling import format_timings
 import os
 
 def run_ga_and_animate(params: dict):
@@ -15,13 +16,14 @@ def run_ga_and_animate(params: dict):
     print(f'------------ GA ({func_name}) -------------')
     
     # --- EXECUÇÃO DO GA ---
-    best_ind, best_cost, population_history, fitness_history, cont = ga(**params)
+    # Métricas calculadas durante a execução, com alvos no ótimo conhecido da função
+    metrics = params.get('metrics') or RunMetrics.for_objective(params['obj_func'], dim=len(params['bounds'][0]))
+    best_ind, best_cost, population_history, fitness_history, cont = ga(**{'profile': True, **params, 'metrics': metrics})
 
      # --- ANÁLISE PÓS-EXECUÇÃO ---
-    discovery_gen = find_discovery(fitness_history, best_cost, threshold_percent=0.1)
+    discovery_gen, discovery_nfe = metrics.discovery(threshold_percent=0.1) # NFE exato acumulado até a descoberta
     
-    evaluations = params['obj_func'].evaluations
-    discovery_nfe = (discovery_gen + 1) * params['num_individuals']
+    evaluations = metrics.evaluations
     
     # --- EXIBIÇÃO DOS RESULTADOS ---
     total_multiplications = params['obj_func'].multiplications + cont['multiplications']
@@ -32,8 +34,13 @@ def run_ga_and_animate(params: dict):
     print(f"Z ótimo: {best_cost:.8f}")
     print(f"Avaliações até encontrar o mínimo global: {discovery_nfe} (Geração {discovery_gen})")
     print(f"Total de avaliações da função: {evaluations}")
+    for target, hit in metrics.target_hits.items():
+        print(f"Z <= {target:.8f}: " + (f"{hit[1]} avaliações (Geração {hit[0]})" if hit else "não atingido"))
     print(f"Multiplicações: {total_multiplications}")
-    print(f"Divisões: {total_divisions}\n")
+    print(f"Divisões: {total_divisions}")
+    if 'timings' in cont:
+        print(f"Tempo por fase: {format_timings(cont['timings'])}")
+    print()
 
     # --- GERAÇÃO DA ANIMAÇÃO DINÂMICA ---
     # Cria diretório se não existir
@@ -0,0 +1,86 @@
+import os
+import numpy as np
+from history import NpyAppender
+
+class RunStore:
+    """
+    Armazenamento colunar (append-only) do fitness de muitas execuções do GA/PSO.
+
+    'path' é um diretório com uma coluna por arquivo .npy e uma linha por geração registrada:
+    - 'run.npy' (L,): número da execução
+    - 'generation.npy' (L,): geração/iteração (0 = população inicial)
+    - 'fitness.npy' (L, N): fitness de toda a população
+    As colunas são sempre .npy válidos e podem ser lidas uma a uma, sob demanda, com
+    open_run_store(). Todas as execuções de um mesmo armazenamento têm o mesmo N.
+
+    Uso:
+        with RunStore('runs/pso', num_individuals=30) as store:
+            for seed in range(1000):
+                pso(obj_func, 30, 200, bounds, history='off', rng=seed, run_store=store)
+    """
+    def __init__(self, path: str, num_individuals: int, append: bool=False):
+        """
+        Args:
+            path (str): Diretório do armazenamento (criado se não existir).
+            num_individuals (int): Número de indivíduos/partículas por geração (N).
+            append (bool): Se True, continua um armazenamento existente; senão, sobrescreve.
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.num_individuals = num_individuals
+        self._run = NpyAppender(os.path.join(path, 'run.npy'), (), dtype=np.int64, append=append)
+        self._generation = NpyAppender(os.path.join(path, 'generation.npy'), (), dtype=np.int64, append=append)
+        self._fitness = NpyAppender(os.path.join(path, 'fitness.npy'), (num_individuals,), append=append)
+        self.num_runs = 0
+        if self._run.rows:
+            self.num_runs = int(np.load(self._run.path, mmap_mode='r').max()) + 1
+
+    def new_run(self) -> int:
+        """ Reserva o número da próxima execução. """
+        run = self.num_runs
+        self.num_runs += 1
+        return run
+
+    def record(self, run: int, generation: int, fitness: np.ndarray):
+        """ Acrescenta o fitness (N,) de uma geração da execução 'run'. """
+        self._run.append(np.int64(run))
+        self._generation.append(np.int64(generation))
+        self._fitness.append(fitness)
+
+    @property
+    def rows(self) -> int:
+        """ Linhas (gerações) gravadas em todas as execuções. """
+        return self._run.rows
+
+    def truncate(self, rows: int):
+        """ Descarta as linhas a partir de 'rows' (ex: gravadas depois de um checkpoint). """
+        self._run.truncate(rows)
+        self._generation.truncate(rows)
+        self._fitness.truncate(rows)
+        self._run.flush()
+        self.num_runs = int(np.load(self._run.path, mmap_mode='r').max()) + 1 if rows else 0
+
+    def close(self):
+        self._run.close()
+        self._generation.close()
+        self._fitness.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def open_run_store(path: str) -> dict:
+    """
+    Abre de forma preguiçosa (memory-mapped) as colunas de um RunStore.
+    Args:
+        path (str): Diretório do armazenamento.
+    Returns:
+        dict: Colunas 'run' (L,), 'generation' (L,) e 'fitness' (L, N), como np.memmap somente leitura.
+              Se a gravação foi interrompida no meio de uma linha, as colunas são truncadas no menor comprimento.
+    """
+    columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+               for name in ('run', 'generation', 'fitness')}
+    rows = min(len(column) for column in columns.values())
+    return {name: column[:rows] for name, column in columns.items()}